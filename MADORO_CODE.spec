@@ -16,6 +16,8 @@ hidden_imports = [
     'context',
     'tools',
     'project_manager',
+    'paths',
+    'jsonutil',
     # PyQt6
     'PyQt6',
     'PyQt6.QtWidgets',
@@ -76,9 +78,11 @@ a = Analysis(
     ['main.py'],
     pathex=['src'],
     binaries=[],
+    # src/ is compiled into the PYZ via pathex/hiddenimports; shipping it
+    # again as data would bundle a second copy of every module
     datas=[
-        ('src', 'src'),
-        ('config', 'config'),
+        # YAML only - a local models.yaml.json parse cache must not ship
+        ('config/*.yaml', 'config'),
         ('assets', 'assets'),
     ],
     hiddenimports=hidden_imports,
@@ -91,19 +95,18 @@ a = Analysis(
 )
 pyz = PYZ(a.pure)
 
+# onedir build: modules load straight from disk instead of being
+# extracted to a temp dir on every launch (--onefile)
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='MADORO_CODE',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
     upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
     console=False,  # No terminal window for release
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -112,3 +115,13 @@ exe = EXE(
     entitlements_file=None,
     icon='assets/icon.ico',
 )
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=True,
+    upx_exclude=[],
+    name='MADORO_CODE',
+)
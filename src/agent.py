@@ -10,14 +10,121 @@ Workflow:
 6. Log work -> feedback to model
 """
 
+import os
+import re
+import sys
 import json
-from typing import Optional, List, Dict, Any
+import hashlib
+import importlib
+import itertools
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Optional, List, Dict, Any, Callable, Iterator, TYPE_CHECKING
 from dataclasses import dataclass
 
-from memory import get_memory_store
-from llm import get_llm_client, LLMResponse
-from tools import ToolExecutor, TOOL_DEFINITIONS, ToolResult
-from context import get_context_builder, ContextPack
+if TYPE_CHECKING:
+    from context import ContextPack
+
+
+class _LazyModule:
+    """Module proxy - imports the real module on first attribute access"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+# Heavy submodules are loaded on first use, not at import time
+_memory = _LazyModule("memory")
+_llm = _LazyModule("llm")
+_tools = _LazyModule("tools")
+_context = _LazyModule("context")
+
+# Directories never searched for test files
+_TEST_SCAN_SKIP_DIRS = {".git", "__pycache__", "node_modules", ".venv", "venv"}
+
+
+# Search query extraction: words of 3+ chars, skipping Korean filler words
+_WORD_RE = re.compile(r"\S{3,}")
+_STOPWORD_PREFIX = ("이", "그", "저", "뭐", "어떻")
+
+
+# Read-only tools that can run concurrently within one LLM turn
+_PARALLEL_SAFE_TOOLS = frozenset({"read_file", "search", "list_files", "get_diff"})
+_MAX_TOOL_WORKERS = 4
+
+# Background auto-test runs, shared by every Agent (created on first use)
+_test_pool: Optional[ThreadPoolExecutor] = None
+_test_pool_lock = threading.Lock()
+
+
+def _get_test_pool() -> ThreadPoolExecutor:
+    """Shared executor for auto-tests overlapped with the summary call"""
+    global _test_pool
+    with _test_pool_lock:
+        if _test_pool is None:
+            _test_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="auto-test")
+        return _test_pool
+
+
+# doctor() report frame
+_DOCTOR_SEP = "=" * 60
+_DOCTOR_HEADER = [_DOCTOR_SEP, "  MADORO CODE Doctor - Project Status Report", _DOCTOR_SEP, ""]
+
+
+def _trunc(text: str, limit: int) -> str:
+    """Truncate to limit chars, without copying when already short enough"""
+    return text if len(text) <= limit else text[:limit]
+
+
+def _apply_patch_detail(args: Dict) -> str:
+    """Progress detail for apply_patch"""
+    files = args.get("files", [])
+    return f"{len(files)} files" if files else ""
+
+
+# Tool name -> progress detail formatter
+_TOOL_DETAIL = {
+    "read_file": lambda args: _trunc(args.get("path", ""), 50),
+    "search": lambda args: f'"{args.get("query", "")}"',
+    "apply_patch": _apply_patch_detail,
+    "run_tests": lambda args: _trunc(args.get("cmd", "pytest"), 30),
+    "list_files": lambda args: _trunc(args.get("path", "."), 30),
+    "get_diff": lambda args: "git changes",
+}
+
+
+def _is_test_file(name: str, parent_name: str) -> bool:
+    """Match test_*.py, *_test.py and tests/*.py"""
+    if not name.endswith(".py"):
+        return False
+    return name.startswith("test_") or name.endswith("_test.py") or parent_name == "tests"
+
+
+def _scan_for_test_files(root: str) -> bool:
+    """Walk the project tree, returning True on the first test file found"""
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        parent_name = os.path.basename(current)
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _TEST_SCAN_SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif _is_test_file(entry.name, parent_name):
+                        return True
+        except OSError:
+            continue
+    return False
 
 
 @dataclass
@@ -26,6 +133,7 @@ class AgentResponse:
     message: str
     tool_results: List[Dict] = None
     error: Optional[str] = None
+    dropped_tool_results: int = 0  # Oldest results beyond MAX_TOOL_RESULTS, not in tool_results
 
 
 class Agent:
@@ -71,26 +179,72 @@ SSOT Update Rules (when user says "save", "update docs", "save progress"):
 """
 
     MAX_ITERATIONS = 5  # Max tool call iterations
+    STREAM_PROGRESS_CHARS = 256  # Report streaming progress every N chars
+    AUTO_TEST_TIMEOUT = 90  # Seconds to wait for background tests (run_tests stops pytest at 60)
+    MAX_LLM_CACHE_ENTRIES = 64  # Memoized responses for temperature 0 models
+    MAX_TOOL_RESULTS = 32  # Tool results kept per request (ring buffer)
+    PROMPT_TOOL_RESULTS = 3  # Most recent tool results shown in the prompt
 
     def __init__(self, project_root: str = ".", progress_callback=None,
-                 ssot_approval_callback=None):
+                 ssot_approval_callback=None, verbose: bool = None):
         self.project_root = project_root
-        self.memory = get_memory_store()
-        self.llm = get_llm_client()
-        self.tools = ToolExecutor(project_root, ssot_approval_callback=ssot_approval_callback)
-        self.context_builder = get_context_builder(project_root)
+        # Console progress logging; off by default when there is no console
+        # (PyInstaller --windowed leaves sys.stdout as None)
+        self.verbose = sys.stdout is not None if verbose is None else verbose
+        self.memory = _memory.get_memory_store()
+        self.llm = _llm.get_llm_client()
+        self.tools = _tools.ToolExecutor(project_root, ssot_approval_callback=ssot_approval_callback)
+        self.context_builder = _context.get_context_builder(project_root)
         self.progress_callback = progress_callback  # Progress callback
         self.ssot_approval_callback = ssot_approval_callback  # SSOT file approval callback
+        self._has_tests: Optional[bool] = None  # Cached test file probe
+        self._llm_cache: Dict[bytes, Any] = {}  # Prompt digest -> LLMResponse (FIFO)
+        self._tools_digest: Optional[bytes] = None
 
     def _report_progress(self, status: str, detail: str = ""):
         """Report progress"""
-        print(f"[Agent] {status}: {detail}")
+        if self.verbose:
+            print(f"[Agent] {status}: {detail}")
         if self.progress_callback:
             self.progress_callback(status, detail)
 
-    def process(self, user_input: str) -> AgentResponse:
-        """Process user input"""
-        self._report_progress("Starting", user_input[:50])
+    def process_stream(self, user_input: str) -> Iterator[str]:
+        """Process user input, yielding the closing summary as it streams in.
+
+        Tool turns are not streamed (their text holds raw tool calls). The
+        final AgentResponse is the generator's return value (StopIteration.value);
+        a reply that needed no tools, or a provider without streaming, yields nothing.
+        """
+        chunks: "queue.Queue[Optional[str]]" = queue.Queue()
+        outcome: Dict[str, Any] = {}
+
+        def run():
+            # The caller echoes chunks to the console - progress goes to
+            # progress_callback only, or its prints would land inside the reply
+            verbose, self.verbose = self.verbose, False
+            try:
+                outcome["response"] = self.process(user_input, on_token=chunks.put)
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                self.verbose = verbose
+                chunks.put(None)
+
+        threading.Thread(target=run, daemon=True).start()
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                break
+            yield chunk
+
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["response"]
+
+    def process(self, user_input: str,
+                on_token: Callable[[str], None] = None) -> AgentResponse:
+        """Process user input (on_token receives the streamed summary text, if supported)"""
+        self._report_progress("Starting", _trunc(user_input, 50))
 
         # Record conversation turn
         self.memory.add_turn("user", user_input)
@@ -103,13 +257,18 @@ SSOT Update Rules (when user says "save", "update docs", "save progress"):
         )
         self._report_progress("Context ready", f"{len(context_pack.project_state)} chars")
 
+        # Context text is identical on every iteration - render it once
+        context_prompt = context_pack.to_prompt()
+
         # LLM call (with tool calls)
-        all_tool_results = []
+        all_tool_results = deque(maxlen=self.MAX_TOOL_RESULTS)
+        total_results = 0  # Every result appended, including those the deque dropped
         final_response = None
+        pending_tests = None  # Auto-test future overlapped with the summary call
 
         for iteration in range(self.MAX_ITERATIONS):
             # Build prompt
-            prompt = self._build_prompt(user_input, context_pack, all_tool_results)
+            prompt = self._build_prompt(user_input, context_prompt, all_tool_results)
 
             # Get current model name
             model_cfg = self.llm.get_model_config()
@@ -117,11 +276,8 @@ SSOT Update Rules (when user says "save", "update docs", "save progress"):
             self._report_progress("LLM call", f"Waiting for {model_name}...")
 
             try:
-                response = self.llm.generate_with_tools(
-                    prompt=prompt,
-                    tools=TOOL_DEFINITIONS,
-                    system=self.SYSTEM_PROMPT
-                )
+                # Not streamed to on_token - tool turns carry raw JSON/XML tool calls
+                response = self._generate_with_tools_cached(prompt, model_cfg)
                 self._report_progress("LLM response", f"Received {len(response.content)} chars")
             except Exception as e:
                 self._report_progress("LLM error", str(e))
@@ -132,48 +288,42 @@ SSOT Update Rules (when user says "save", "update docs", "save progress"):
 
             # Process tool calls
             if response.tool_calls:
-                for tool_call in response.tool_calls:
+                results = self._execute_tool_calls(response.tool_calls)
+                patch_applied = False
+                for tool_call, result in zip(response.tool_calls, results):
                     tool_name = tool_call.get("tool", "")
                     tool_args = tool_call.get("args", {})
 
-                    # Show tool execution status
-                    tool_detail = self._get_tool_detail(tool_name, tool_args)
-                    self._report_progress("Running tool", f"{tool_name}: {tool_detail}")
-
-                    result = self.tools.execute(tool_name, tool_args)
-                    status = "✓" if result.success else "✗"
-                    self._report_progress("Tool done", f"{status} {tool_name}")
+                    if tool_name == "apply_patch" and result.success:
+                        patch_applied = True
+                        if self._has_tests is False:
+                            self._invalidate_test_probe(tool_args)
 
                     all_tool_results.append({
                         "tool": tool_name,
                         "args": tool_args,
                         "success": result.success,
-                        "output": result.output[:500],
+                        "output": _trunc(result.output, 500),
                         "error": result.error
                     })
+                    total_results += 1
 
                 # Auto-run tests after patch applied (only if test files exist)
-                if any(tc.get("tool") == "apply_patch" and tc.get("success")
-                       for tc in all_tool_results):
+                if patch_applied:
                     # Check if test files exist before running tests
-                    from pathlib import Path
-                    project_path = Path(self.project_root)
-                    test_files_exist = (
-                        list(project_path.rglob("test_*.py")) or
-                        list(project_path.rglob("*_test.py")) or
-                        list(project_path.rglob("tests/*.py"))
-                    )
-
-                    if test_files_exist:
-                        self._report_progress("Running tests", "Executing pytest...")
-                        test_result = self.tools.execute("run_tests", {"cmd": "pytest -q"})
-                        status = "✓ Passed" if test_result.success else "✗ Failed"
-                        self._report_progress("Tests done", status)
-                        all_tool_results.append({
-                            "tool": "run_tests (auto)",
-                            "success": test_result.success,
-                            "output": test_result.output[:300]
-                        })
+                    if self._test_files_exist():
+                        if iteration == self.MAX_ITERATIONS - 1:
+                            # Last iteration: no further tool turn will read the
+                            # results, so run pytest alongside the summary call
+                            self._report_progress("Running tests", "Executing pytest (background)...")
+                            pending_tests = _get_test_pool().submit(
+                                self.tools.execute, "run_tests", {"cmd": "pytest -q"}
+                            )
+                        else:
+                            self._report_progress("Running tests", "Executing pytest...")
+                            test_result = self.tools.execute("run_tests", {"cmd": "pytest -q"})
+                            self._record_auto_tests(all_tool_results, test_result)
+                            total_results += 1
                     else:
                         self._report_progress("Tests skipped", "No test files found")
             else:
@@ -188,75 +338,222 @@ SSOT Update Rules (when user says "save", "update docs", "save progress"):
                 user_input, context_pack, all_tool_results
             )
             try:
-                response = self.llm.generate(summary_prompt, system=self.SYSTEM_PROMPT)
+                response = self.llm.generate(summary_prompt, system=self.SYSTEM_PROMPT,
+                                             on_chunk=self._make_stream_reporter(on_token))
                 final_response = response.content
             except Exception as e:
                 final_response = f"Task complete. (Summary generation failed: {e})"
 
+        if pending_tests is not None:
+            try:
+                test_result = pending_tests.result(timeout=self.AUTO_TEST_TIMEOUT)
+            except FutureTimeoutError:
+                message = f"Test timeout ({self.AUTO_TEST_TIMEOUT}s)"
+                test_result = _tools.ToolResult(False, message, message)
+            self._record_auto_tests(all_tool_results, test_result)
+            total_results += 1
+            # The summary was written while pytest ran - state the outcome explicitly
+            if test_result.success:
+                final_response += "\n\n[Auto-test] ✓ Passed (pytest -q)"
+            else:
+                final_response += (
+                    f"\n\n[Auto-test] ✗ Failed (pytest -q)\n{_trunc(test_result.output, 300)}"
+                )
+
+        dropped = total_results - len(all_tool_results)
+        if dropped:
+            self._report_progress(
+                "Tool results trimmed",
+                f"{dropped} oldest of {total_results} not kept (limit {self.MAX_TOOL_RESULTS})"
+            )
+
         self._report_progress("Complete", "")
 
-        # Record response
-        self.memory.add_turn("assistant", final_response[:500])
-
-        # Log work
-        self.memory.log_work(
-            action="CHAT",
-            target="agent",
-            description=user_input[:100],
-            result="SUCCESS",
-            details={
-                "tool_calls": len(all_tool_results),
-                "response_length": len(final_response)
-            }
-        )
+        # Record response and log work (one commit)
+        with self.memory.batch():
+            self.memory.add_turn("assistant", final_response, max_chars=500)
+            self.memory.log_work(
+                action="CHAT",
+                target="agent",
+                description=user_input,
+                result="SUCCESS",
+                details={
+                    "tool_calls": total_results,
+                    "tool_results_dropped": dropped,
+                    "response_length": len(final_response)
+                },
+                max_chars=100
+            )
 
         return AgentResponse(
             message=final_response,
-            tool_results=all_tool_results
+            tool_results=list(all_tool_results),
+            dropped_tool_results=dropped
+        )
+
+    def _generate_with_tools_cached(self, prompt: str, model_cfg):
+        """LLM call with tools, memoized per session for deterministic models.
+
+        Only temperature 0 models are cached - otherwise a repeat prompt is
+        expected to produce a different answer. Replies with tool calls are never
+        cached: replaying one would re-run apply_patch/run_tests without the model.
+        """
+        cache_key = None
+        if model_cfg is not None and model_cfg.temperature == 0:
+            if self._tools_digest is None:
+                self._tools_digest = hashlib.blake2b(
+                    json.dumps(_tools.TOOL_DEFINITIONS, sort_keys=True).encode("utf-8"),
+                    digest_size=16
+                ).digest()
+            h = hashlib.blake2b(digest_size=16)
+            for part in (model_cfg.name, self.SYSTEM_PROMPT, prompt):
+                h.update(part.encode("utf-8"))
+                h.update(b"\0")
+            h.update(self._tools_digest)
+            cache_key = h.digest()
+
+            cached = self._llm_cache.get(cache_key)
+            if cached is not None:
+                self._report_progress("LLM cache hit", model_cfg.display_name)
+                return cached
+
+        response = self.llm.generate_with_tools(
+            prompt=prompt,
+            tools=_tools.TOOL_DEFINITIONS,
+            system=self.SYSTEM_PROMPT,
+            on_chunk=self._make_stream_reporter()
         )
 
+        if cache_key is not None and not response.tool_calls:
+            if len(self._llm_cache) >= self.MAX_LLM_CACHE_ENTRIES:
+                # FIFO eviction - dicts keep insertion order
+                del self._llm_cache[next(iter(self._llm_cache))]
+            self._llm_cache[cache_key] = response
+        return response
+
+    def _make_stream_reporter(self, on_token: Callable[[str], None] = None):
+        """Chunk callback that forwards text to on_token and reports received
+        size every STREAM_PROGRESS_CHARS"""
+        received = 0
+        next_report = self.STREAM_PROGRESS_CHARS
+
+        def on_chunk(chunk: str):
+            nonlocal received, next_report
+            if on_token:
+                on_token(chunk)
+            received += len(chunk)
+            if received >= next_report:
+                next_report = received + self.STREAM_PROGRESS_CHARS
+                self._report_progress("LLM streaming", f"{received} chars")
+
+        return on_chunk
+
+    def _execute_tool_calls(self, tool_calls: List[Dict]) -> List[Any]:
+        """Execute tool calls, returning results in call order.
+
+        Consecutive read-only calls run concurrently; any other tool acts as
+        a barrier and runs alone, so writes still see earlier reads/writes
+        in the order the model issued them.
+        """
+        results: List[Any] = [None] * len(tool_calls)
+        batch: List[int] = []
+
+        def flush_batch():
+            if len(batch) == 1:
+                run_one(batch[0])
+            elif batch:
+                for i in batch:
+                    self._report_tool_start(tool_calls[i])
+                with ThreadPoolExecutor(max_workers=min(_MAX_TOOL_WORKERS, len(batch))) as pool:
+                    futures = [
+                        (i, pool.submit(self.tools.execute,
+                                        tool_calls[i].get("tool", ""),
+                                        tool_calls[i].get("args", {})))
+                        for i in batch
+                    ]
+                    for i, future in futures:
+                        results[i] = future.result()
+                        self._report_tool_done(tool_calls[i], results[i])
+            batch.clear()
+
+        def run_one(i: int):
+            self._report_tool_start(tool_calls[i])
+            results[i] = self.tools.execute(tool_calls[i].get("tool", ""),
+                                            tool_calls[i].get("args", {}))
+            self._report_tool_done(tool_calls[i], results[i])
+
+        for i, tool_call in enumerate(tool_calls):
+            if tool_call.get("tool", "") in _PARALLEL_SAFE_TOOLS:
+                batch.append(i)
+            else:
+                flush_batch()
+                run_one(i)
+        flush_batch()
+
+        return results
+
+    def _report_tool_start(self, tool_call: Dict):
+        """Show tool execution status"""
+        tool_name = tool_call.get("tool", "")
+        tool_detail = self._get_tool_detail(tool_name, tool_call.get("args", {}))
+        self._report_progress("Running tool", f"{tool_name}: {tool_detail}")
+
+    def _report_tool_done(self, tool_call: Dict, result):
+        """Show tool result status"""
+        status = "✓" if result.success else "✗"
+        self._report_progress("Tool done", f"{status} {tool_call.get('tool', '')}")
+
+    def _record_auto_tests(self, all_tool_results: "deque[Dict]", test_result):
+        """Report and record an auto-run test result"""
+        status = "✓ Passed" if test_result.success else "✗ Failed"
+        self._report_progress("Tests done", status)
+        all_tool_results.append({
+            "tool": "run_tests (auto)",
+            "success": test_result.success,
+            "output": _trunc(test_result.output, 300)
+        })
+
+    def _test_files_exist(self) -> bool:
+        """Check if the project has test files (probed once, then cached)"""
+        if self._has_tests is None:
+            self._has_tests = _scan_for_test_files(str(self.project_root))
+        return self._has_tests
+
+    def _invalidate_test_probe(self, patch_args: Dict):
+        """Re-probe tests only if a patch touched a test file path"""
+        for file_patch in patch_args.get("files", []):
+            path = file_patch.get("path", "")
+            if _is_test_file(os.path.basename(path), os.path.basename(os.path.dirname(path))):
+                self._has_tests = None
+                return
+
     def _get_tool_detail(self, tool_name: str, args: Dict) -> str:
         """Generate tool execution detail info"""
-        if tool_name == "read_file":
-            return args.get("path", "")[:50]
-        elif tool_name == "search":
-            return f'"{args.get("query", "")}"'
-        elif tool_name == "apply_patch":
-            files = args.get("files", [])
-            if files:
-                return f"{len(files)} files"
-            return ""
-        elif tool_name == "run_tests":
-            return args.get("cmd", "pytest")[:30]
-        elif tool_name == "list_files":
-            return args.get("path", ".")[:30]
-        elif tool_name == "get_diff":
-            return "git changes"
-        return ""
+        detail = _TOOL_DETAIL.get(tool_name)
+        return detail(args) if detail else ""
 
     def _extract_search_query(self, user_input: str) -> str:
         """Extract search query from user input"""
-        # Simple keyword extraction
-        keywords = []
-        for word in user_input.split():
-            if len(word) > 2:
-                keywords.append(word)
-        return ' '.join(keywords[:3])
-
-    def _build_prompt(self, user_input: str, context: ContextPack,
-                      tool_results: List[Dict]) -> str:
-        """Build LLM prompt"""
+        # Simple keyword extraction (first 3 matches only)
+        keywords = (w for w in _WORD_RE.findall(user_input)
+                    if not w.startswith(_STOPWORD_PREFIX))
+        return ' '.join(itertools.islice(keywords, 3))
+
+    def _build_prompt(self, user_input: str, context_prompt: str,
+                      tool_results: "deque[Dict]") -> str:
+        """Build LLM prompt (context_prompt is the pre-rendered context pack)"""
         parts = []
 
         # Context
-        parts.append(context.to_prompt())
+        parts.append(context_prompt)
 
         # Previous tool results
         if tool_results:
             parts.append("[TOOL RESULTS]")
-            for tr in tool_results[-3:]:  # Last 3 only
+            recent = list(itertools.islice(reversed(tool_results), self.PROMPT_TOOL_RESULTS))
+            for tr in reversed(recent):  # Last N only, oldest first
                 status = "✅" if tr.get("success") else "❌"
-                parts.append(f"{status} {tr.get('tool')}: {tr.get('output', '')[:200]}")
+                parts.append(f"{status} {tr.get('tool')}: {_trunc(tr.get('output', ''), 200)}")
             parts.append("")
 
         # User request
@@ -265,7 +562,7 @@ SSOT Update Rules (when user says "save", "update docs", "save progress"):
 
         return "\n".join(parts)
 
-    def _build_summary_prompt(self, user_input: str, context: ContextPack,
+    def _build_summary_prompt(self, user_input: str, context: "ContextPack",
                               tool_results: List[Dict]) -> str:
         """Build final summary prompt"""
         parts = []
@@ -287,26 +584,21 @@ SSOT Update Rules (when user says "save", "update docs", "save progress"):
         """Project status diagnosis (vibe doctor)"""
         context = self.context_builder.build(task="Project status check")
 
-        report = []
-        report.append("=" * 60)
-        report.append("  MADORO CODE Doctor - Project Status Report")
-        report.append("=" * 60)
-        report.append("")
+        report = list(_DOCTOR_HEADER)
 
         # Project status
         report.append("[📋 Project Status]")
-        # Extract current state from HANDOVER.md
+        # Extract current state (table rows) from HANDOVER.md
         if "Current" in context.project_state or "Status" in context.project_state:
-            for line in context.project_state.split('\n'):
-                if '|' in line:
-                    report.append(f"  {line.strip()}")
+            report.extend([f"  {line.strip()}"
+                           for line in context.project_state.split('\n') if '|' in line])
         report.append("")
 
         # Open issues
         report.append("[🐛 Open Issues]")
         if context.open_issues:
             for issue in context.open_issues:
-                report.append(f"  [{issue['severity']}] {issue['title']}")
+                report.append(f"  [{issue.severity}] {issue.title}")
         else:
             report.append("  None")
         report.append("")
@@ -314,18 +606,17 @@ SSOT Update Rules (when user says "save", "update docs", "save progress"):
         # Recent changes
         report.append("[📝 Recent Changes]")
         if context.recent_changes and context.recent_changes != "(No git history)":
-            for line in context.recent_changes.split('\n')[:5]:
-                report.append(f"  {line}")
+            report.extend([f"  {line}" for line in context.recent_changes.split('\n', 5)[:5]])
         else:
             report.append("  No changes")
         report.append("")
 
         # Recent conversation
         report.append("[💬 Recent Conversation]")
-        if context.recent_turns:
-            for turn in context.recent_turns[-3:]:
-                content = turn['content'][:50] + "..." if len(turn['content']) > 50 else turn['content']
-                report.append(f"  [{turn['role']}] {content}")
+        if context.turn_roles:
+            for role, content in zip(context.turn_roles[-3:], context.turn_contents[-3:]):
+                content = content[:50] + "..." if len(content) > 50 else content
+                report.append(f"  [{role}] {content}")
         else:
             report.append("  No conversation")
         report.append("")
@@ -336,14 +627,17 @@ SSOT Update Rules (when user says "save", "update docs", "save progress"):
         connected = self.llm.check_connection()
         report.append(f"  Ollama connection: {'✅ Connected' if connected else '❌ Not connected'}")
         if connected:
-            for model_key in self.llm.list_models():
-                available = self.llm.check_model_available(model_key)
+            # Probe all models concurrently - each check is a network round trip
+            model_keys = self.llm.list_models()
+            with ThreadPoolExecutor(max_workers=min(8, len(model_keys) or 1)) as pool:
+                availability = list(pool.map(self.llm.check_model_available, model_keys))
+            for model_key, available in zip(model_keys, availability):
                 cfg = self.llm.models[model_key]
                 status = "✅" if available else "❌"
                 report.append(f"  {status} {cfg.display_name}")
         report.append("")
 
-        report.append("=" * 60)
+        report.append(_DOCTOR_SEP)
 
         return "\n".join(report)
 
@@ -368,26 +662,26 @@ def get_agent(project_root: str = ".") -> Agent:
 # ============================================
 
 if __name__ == "__main__":
-    print("=" * 60)
-    print("  MADORO CODE Agent Test")
-    print("=" * 60)
+    print("\n".join([_DOCTOR_SEP, "  MADORO CODE Agent Test", _DOCTOR_SEP]))
 
     agent = Agent(".")
 
-    print("\n[1] Doctor")
-    print(agent.doctor())
+    print("\n[1] Doctor\n" + agent.doctor())
 
-    print("\n[2] Connection Check")
+    lines = ["\n[2] Connection Check"]
     if agent.llm.check_connection():
-        print("  Ollama connected!")
+        lines.append("  Ollama connected!")
 
         # Simple test
-        print("\n[3] Simple Request")
+        lines.append("\n[3] Simple Request")
+        print("\n".join(lines))
+        lines = []
         response = agent.process("Show me the file list in current directory")
-        print(f"  Response: {response.message[:200]}...")
+        lines.append(f"  Response: {response.message[:200]}...")
         if response.tool_results:
-            print(f"  Tool calls: {len(response.tool_results)}")
+            lines.append(f"  Tool calls: {len(response.tool_results)}")
     else:
-        print("  ❌ Ollama not connected. Start Ollama first.")
+        lines.append("  ❌ Ollama not connected. Start Ollama first.")
 
-    print("\n" + "=" * 60)
+    lines.append("\n" + _DOCTOR_SEP)
+    print("\n".join(lines))
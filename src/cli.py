@@ -7,29 +7,125 @@ Commands:
 - vibe chat --model <model>: Chat with specific model
 """
 
+import io
 import sys
 import os
+import re
+import time
+import threading
 import argparse
 from pathlib import Path
 
-# Set project root
+# Set project root - paths resolve from here instead of chdir-ing into it
 PROJECT_ROOT = Path(__file__).parent.parent.resolve()
-os.chdir(PROJECT_ROOT)
-sys.path.insert(0, str(PROJECT_ROOT / "src"))
+os.environ.setdefault('MADORO_CODE_BASE', str(PROJECT_ROOT))
+os.environ.setdefault('MADORO_CODE_BUNDLE', str(PROJECT_ROOT))
 
-from agent import get_agent
-from llm import get_llm_client
-from memory import get_memory_store
+# Running `python src/cli.py` already puts src/ first on sys.path
+_SRC_PATH = str(PROJECT_ROOT / "src")
+if _SRC_PATH not in sys.path:
+    sys.path.insert(0, _SRC_PATH)
+
+# agent/llm/memory are imported inside the commands that use them, so
+# `vibe --help` does not pay for yaml/requests/sqlite imports
+
+
+def _write_block(lines: list):
+    """Write a block of lines with a single write + flush"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+KEEP_WARM_INTERVAL = 4 * 60  # Seconds between Ollama keep-warm pings
+DEFAULT_KEEP_ALIVE = 5 * 60  # Ollama's own default when keep_alive is not set
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def _keep_alive_seconds(keep_alive) -> float:
+    """Ollama keep_alive ("30m", "1h30m", 300, "-1") in seconds; negative = forever"""
+    if keep_alive is None or keep_alive == "":
+        return DEFAULT_KEEP_ALIVE
+    text = str(keep_alive).strip()
+    if text.startswith("-"):
+        return float("inf")
+    try:
+        return float(text)  # Plain number = seconds
+    except ValueError:
+        pass
+    parts = _DURATION_RE.findall(text)
+    if not parts:
+        return DEFAULT_KEEP_ALIVE
+    return sum(float(n) * _DURATION_UNITS[unit] for n, unit in parts)
+
+
+def _keep_warm(llm, stop: threading.Event, last_input: list):
+    """Keep the current Ollama model loaded while the user is active.
+
+    Pings stop once keep_alive has passed since the last input (last_input[0],
+    monotonic), so an idle session lets Ollama unload the model as configured.
+    """
+    while True:
+        if time.monotonic() - last_input[0] < _keep_alive_seconds(llm.keep_alive):
+            llm.preload()
+        if stop.wait(KEEP_WARM_INTERVAL):
+            return
+
+
+# ============================================
+# Chat REPL Commands
+# ============================================
+# Handlers take (agent, llm, arg) and return True to leave the REPL.
+
+def _repl_exit(agent, llm, arg) -> bool:
+    print("Goodbye!")
+    return True
+
+
+def _repl_doctor(agent, llm, arg) -> bool:
+    print(agent.doctor())
+    return False
+
+
+def _repl_clear(agent, llm, arg) -> bool:
+    from memory import get_memory_store
+    get_memory_store().clear_conversation()
+    print("Conversation cleared")
+    return False
+
+
+def _repl_model(agent, llm, model_name) -> bool:
+    if llm.set_model(model_name):
+        print(f"Model changed: {llm.get_model_config().display_name}")
+    else:
+        print(f"Unknown model: {model_name}")
+        print(f"Available: {llm.list_models()}")
+    return False
+
+
+# Whole-input (lowercased) commands
+_REPL_COMMANDS = {
+    "exit": _repl_exit,
+    "quit": _repl_exit,
+    "q": _repl_exit,
+    "doctor": _repl_doctor,
+    "clear": _repl_clear,
+}
 
 
 def cmd_doctor(args):
     """Diagnose project status"""
+    from agent import get_agent
     agent = get_agent(str(PROJECT_ROOT))
     print(agent.doctor())
 
 
 def cmd_chat(args):
     """Start conversation"""
+    from agent import get_agent
+    from llm import get_llm_client
+
     agent = get_agent(str(PROJECT_ROOT))
     llm = get_llm_client()
 
@@ -48,66 +144,95 @@ def cmd_chat(args):
         print("   ollama serve")
         return
 
-    # Check model
+    # Check model - answered from the tag list check_connection() just fetched
     if not llm.check_model_available():
         model_cfg = llm.get_model_config()
         print(f"❌ Model not found: {model_cfg.ollama_model}")
         print(f"   ollama pull {model_cfg.ollama_model}")
         return
 
+    # Replies are echoed as they stream; [LLM] call logs would interleave with them
+    llm.verbose = False
+
+    # Piped stdout (e.g. `vibe chat < script | tee log`): full block buffering,
+    # output is flushed once per turn instead of per line
+    if not sys.stdout.isatty() and hasattr(sys.stdout, "buffer"):
+        sys.stdout.flush()
+        sys.stdout = io.TextIOWrapper(
+            sys.stdout.buffer, encoding=sys.stdout.encoding, errors=sys.stdout.errors,
+            line_buffering=False, write_through=False
+        )
+
     # Start conversation
-    print("=" * 60)
-    print("  MADORO CODE Chat")
-    print(f"  Model: {llm.get_model_config().display_name}")
-    print("  Type 'exit' to quit, 'doctor' for status")
-    print("=" * 60)
-    print()
+    _write_block([
+        "=" * 60,
+        "  MADORO CODE Chat",
+        f"  Model: {llm.get_model_config().display_name}",
+        "  Type 'exit' to quit, 'doctor' for status",
+        "=" * 60,
+        ""
+    ])
+
+    # Background work overlapping user typing: model load/keep-warm now,
+    # SSOT refresh after every response (input() blocks the main thread)
+    stop_warm = threading.Event()
+    last_input = [time.monotonic()]
+    threading.Thread(target=_keep_warm, args=(llm, stop_warm, last_input), daemon=True).start()
 
     while True:
         try:
             user_input = input("You: ").strip()
+            last_input[0] = time.monotonic()
 
             if not user_input:
                 continue
 
-            if user_input.lower() in ['exit', 'quit', 'q']:
-                print("Goodbye!")
-                break
-
-            if user_input.lower() == 'doctor':
-                print(agent.doctor())
-                continue
-
-            if user_input.lower() == 'clear':
-                memory = get_memory_store()
-                memory.clear_conversation()
-                print("Conversation cleared")
+            # REPL commands: one dict lookup on the whole input, then `model <name>`
+            handler = _REPL_COMMANDS.get(user_input.lower())
+            arg = ""
+            if handler is None:
+                cmd, _, rest = user_input.partition(" ")
+                if cmd.lower() == "model" and rest.strip():
+                    handler, arg = _repl_model, rest.strip()
+            if handler is not None:
+                if handler(agent, llm, arg):
+                    break
                 continue
 
-            if user_input.lower().startswith('model '):
-                model_name = user_input[6:].strip()
-                if llm.set_model(model_name):
-                    print(f"Model changed: {llm.get_model_config().display_name}")
-                else:
-                    print(f"Unknown model: {model_name}")
-                    print(f"Available: {llm.list_models()}")
-                continue
-
-            # Agent processing
-            print("...")
-            response = agent.process(user_input)
-
+            # Agent processing - LLM text is echoed as it streams
+            sys.stdout.write("\nVibe: ")
+            sys.stdout.flush()
+            streamed = []
+            stream = agent.process_stream(user_input)
+            while True:
+                try:
+                    chunk = next(stream)
+                except StopIteration as stop:
+                    response = stop.value
+                    break
+                streamed.append(chunk)
+                sys.stdout.write(chunk)
+                sys.stdout.flush()
+
+            parts = []
             if response.error:
-                print(f"❌ Error: {response.error}")
+                parts.append(f"❌ Error: {response.error}")
             else:
-                print(f"\nVibe: {response.message}")
+                if not "".join(streamed).endswith(response.message):
+                    # Not streamed (provider without streaming, cached response)
+                    parts.append(response.message)
                 if response.tool_results:
-                    print(f"\n[Tools executed: {len(response.tool_results)}]")
+                    shown = len(response.tool_results)
+                    total = shown + response.dropped_tool_results
+                    parts.append(f"\n[Tools executed: {total}]" if total == shown else
+                                 f"\n[Tools executed: {total} (last {shown} shown)]")
                     for tr in response.tool_results:
                         status = "✅" if tr.get("success") else "❌"
-                        print(f"  {status} {tr.get('tool')}")
+                        parts.append(f"  {status} {tr.get('tool')}")
+            parts.append("")
+            _write_block(parts)
 
-            print()
+            threading.Thread(target=agent.context_builder.prefetch_ssot, daemon=True).start()
 
         except KeyboardInterrupt:
             print("\n\nGoodbye!")
@@ -116,15 +241,21 @@ def cmd_chat(args):
             print("\nGoodbye!")
             break
 
+    stop_warm.set()
+
 
 def cmd_models(args):
     """List available models"""
+    from llm import get_llm_client
     llm = get_llm_client()
 
     print("Available models:")
     print("-" * 40)
 
     connected = llm.check_connection()
+    if connected:
+        # One /api/tags fetch for the whole list - per-model checks reuse it
+        llm.list_ollama_tags()
 
     for model_key in llm.list_models():
         cfg = llm.models[model_key]
@@ -8,15 +8,25 @@ Core Principles:
 """
 
 import os
-import yaml
+import itertools
 from pathlib import Path
 from typing import Dict, List, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-from memory import get_memory_store
+from memory import get_memory_store, Issue
 
 
-@dataclass
+# Static to_prompt() section headers
+_HEADER_PROJECT_STATE = "[PROJECT STATE]\n"
+_HEADER_CURRENT_TASK = "[CURRENT TASK]\n"
+_HEADER_RELATED_FILES = "[RELATED FILES]\n"
+_HEADER_OPEN_ISSUES = "[OPEN ISSUES]\n"
+_HEADER_RECENT_CHANGES = "[RECENT CHANGES]\n"
+_HEADER_RECENT_CONVERSATION = "[RECENT CONVERSATION]\n"
+_TRUNCATED_MARK = "\n... (truncated)"
+
+
+@dataclass(slots=True)
 class ContextPack:
     """Context Pack - Minimal info to pass to LLM"""
     # Project state (SSOT)
@@ -28,108 +38,211 @@ class ContextPack:
     # Related files (evidence)
     related_files: List[Dict]
 
-    # Recent conversation (N turns only)
-    recent_turns: List[Dict]
-
-    # Open issues
-    open_issues: List[Dict]
+    # Open issues (memory store objects, read by attribute)
+    open_issues: List[Issue]
 
     # Recent changes
     recent_changes: str
 
+    # Recent conversation (N turns only), stored column-wise, oldest first
+    turn_roles: List[str] = field(default_factory=list)
+    turn_contents: List[str] = field(default_factory=list)
+
+    @property
+    def recent_turns(self) -> List[Dict]:
+        """Recent turns as role/content dicts (built on demand)"""
+        return [{"role": role, "content": content}
+                for role, content in zip(self.turn_roles, self.turn_contents)]
+
     def to_prompt(self) -> str:
-        """Convert to LLM prompt"""
-        sections = []
+        """Convert to LLM prompt
 
-        # Project state
-        sections.append("[PROJECT STATE]")
-        sections.append(self.project_state)
-        sections.append("")
+        Sections run from most to least stable (SSOT -> issues -> files ->
+        git status -> conversation -> task), so consecutive prompts share
+        the longest possible prefix and Ollama only has to prefill the
+        changed tail - the unchanged head is served from its KV cache.
+        """
+        # Newline-terminated fragments, joined once
+        parts = [_HEADER_PROJECT_STATE, self.project_state, "\n\n"]
 
-        # Current task
-        if self.current_task:
-            sections.append("[CURRENT TASK]")
-            sections.append(self.current_task)
-            sections.append("")
+        # Open issues (max 3)
+        if self.open_issues:
+            parts.append(_HEADER_OPEN_ISSUES)
+            parts += (f"- [{issue.severity}] {issue.title}\n"
+                      for issue in itertools.islice(self.open_issues, 3))
+            parts.append("\n")
 
-        # Related files
+        # Related files (max 5)
         if self.related_files:
-            sections.append("[RELATED FILES]")
-            for f in self.related_files[:5]:  # Max 5
-                sections.append(f"--- {f['path']} ---")
+            parts.append(_HEADER_RELATED_FILES)
+            for f in itertools.islice(self.related_files, 5):
                 content = f.get('content', '')
-                if len(content) > 500:
-                    content = content[:500] + "\n... (truncated)"
-                sections.append(content)
-                sections.append("")
-
-        # Open issues
-        if self.open_issues:
-            sections.append("[OPEN ISSUES]")
-            for issue in self.open_issues[:3]:  # Max 3
-                sections.append(f"- [{issue['severity']}] {issue['title']}")
-            sections.append("")
+                head = content[:500]
+                parts += ("--- ", f['path'], " ---\n", head,
+                          _TRUNCATED_MARK if len(head) < len(content) else "", "\n\n")
 
         # Recent changes
         if self.recent_changes:
-            sections.append("[RECENT CHANGES]")
-            sections.append(self.recent_changes[:500])
-            sections.append("")
+            parts += (_HEADER_RECENT_CHANGES, self.recent_changes[:500], "\n\n")
+
+        # Recent conversation (last 3 turns only)
+        if self.turn_roles:
+            parts.append(_HEADER_RECENT_CONVERSATION)
+            parts += (f"{role}: {content[:200]}\n"
+                      for role, content in zip(self.turn_roles[-3:], self.turn_contents[-3:]))
+            parts.append("\n")
+
+        # Current task
+        if self.current_task:
+            parts += (_HEADER_CURRENT_TASK, self.current_task, "\n\n")
+
+        # Every section ends in a blank line; drop the final newline
+        return "".join(parts)[:-1]
 
-        # Recent conversation
-        if self.recent_turns:
-            sections.append("[RECENT CONVERSATION]")
-            for turn in self.recent_turns[-3:]:  # Last 3 turns only
-                role = turn.get('role', 'unknown')
-                content = turn.get('content', '')[:200]
-                sections.append(f"{role}: {content}")
-            sections.append("")
 
-        return "\n".join(sections)
+# pygit2 status flag bits (libgit2 git_status_t)
+_GIT_INDEX_FLAGS = ((1, "A"), (2, "M"), (4, "D"), (8, "R"), (16, "T"))
+_GIT_WT_FLAGS = ((256, "M"), (512, "D"), (1024, "T"), (2048, "R"))
+_GIT_WT_NEW = 128
+_GIT_CONFLICTED = 32768
+
+
+def _short_status(flags: int) -> str:
+    """Two-letter 'git status --short' code for pygit2 status flags"""
+    if flags & _GIT_CONFLICTED:
+        return "UU"
+    index = next((code for bit, code in _GIT_INDEX_FLAGS if flags & bit), " ")
+    if flags & _GIT_WT_NEW and index == " ":
+        return "??"
+    worktree = next((code for bit, code in _GIT_WT_FLAGS if flags & bit), " ")
+    return index + worktree
+
+
+# Parsed config/models.yaml per path: path -> (st_mtime_ns, config dict)
+_CONFIG_CACHE: Dict[Path, tuple] = {}
 
 
 class ContextBuilder:
     """Context Pack Builder"""
 
+    __slots__ = ("project_root", "memory", "config", "_max_recent_turns",
+                 "_max_related_files", "_git_repo", "_ssot_cache")
+
     def __init__(self, project_root: str = "."):
         self.project_root = Path(project_root).resolve()
         self.memory = get_memory_store()
         self.config = self._load_config()
+        context_cfg = self.config.get("context", {})
+        self._max_recent_turns = context_cfg.get("max_recent_turns", 5)
+        self._max_related_files = context_cfg.get("max_related_files", 10)
+        self._git_repo = None  # pygit2 Repository (lazy); False = use git CLI
+        # SSOT path -> (st_mtime_ns, st_size, trimmed text)
+        self._ssot_cache: Dict[Path, tuple] = {}
 
     def _load_config(self) -> Dict:
-        """Load configuration"""
+        """Load configuration (parsed once per file version, shared across builders)"""
         config_path = self.project_root / "config" / "models.yaml"
-        if config_path.exists():
-            with open(config_path, "r", encoding="utf-8") as f:
-                return yaml.safe_load(f)
-        return {}
+        try:
+            mtime_ns = config_path.stat().st_mtime_ns
+        except OSError:
+            return {}
+
+        cached = _CONFIG_CACHE.get(config_path)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+
+        import yaml
+        # libyaml C loader when available
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        with open(config_path, "rb") as f:
+            config = yaml.load(f, Loader=loader) or {}
+        _CONFIG_CACHE[config_path] = (mtime_ns, config)
+        return config
+
+    def prefetch_ssot(self):
+        """Refresh the SSOT cache ahead of the next build()"""
+        try:
+            self._read_ssot()
+        except Exception as e:
+            print(f"[Context] SSOT prefetch failed: {e}")
 
     def _read_ssot(self) -> str:
         """Read SSOT documents"""
         ssot_parts = []
 
-        # HANDOVER.md (current state)
-        handover_path = self.project_root / "HANDOVER.md"
-        if handover_path.exists():
-            content = handover_path.read_text(encoding="utf-8")
-            # Extract summary only (first 50 lines)
-            lines = content.split('\n')[:50]
+        # HANDOVER.md (current state) - summary only (first 50 lines)
+        handover = self._read_ssot_head(self.project_root / "HANDOVER.md", 50)
+        if handover is not None:
             ssot_parts.append("## Current State (HANDOVER.md)")
-            ssot_parts.append('\n'.join(lines))
-
-        # CONSTITUTION.md (rules) - core only
-        constitution_path = self.project_root / "CONSTITUTION.md"
-        if constitution_path.exists():
-            content = constitution_path.read_text(encoding="utf-8")
-            # First 30 lines only
-            lines = content.split('\n')[:30]
+            ssot_parts.append(handover)
+
+        # CONSTITUTION.md (rules) - core only (first 30 lines)
+        constitution = self._read_ssot_head(self.project_root / "CONSTITUTION.md", 30)
+        if constitution is not None:
             ssot_parts.append("\n## Rules (CONSTITUTION.md)")
-            ssot_parts.append('\n'.join(lines))
+            ssot_parts.append(constitution)
 
         return '\n'.join(ssot_parts) if ssot_parts else "(No SSOT documents found)"
 
+    def _read_ssot_head(self, path: Path, max_lines: int) -> Optional[str]:
+        """First max_lines of an SSOT file, cached until its mtime/size change
+
+        Cache hit: a single stat. Miss: open + fstat (no separate exists()).
+        """
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+
+        cached = self._ssot_cache.get(path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+
+        # Stream only the head - never load a large file just to keep N lines.
+        # The cache key comes from fstat on the open handle, so it describes
+        # exactly the version that was read.
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                st = os.fstat(f.fileno())
+                lines = list(itertools.islice(f, max_lines))
+        except FileNotFoundError:
+            self._ssot_cache.pop(path, None)
+            return None
+        text = ''.join(lines)
+        if len(lines) == max_lines and text.endswith('\n'):
+            text = text[:-1]  # Same shape as the old split('\n')[:N] join
+        self._ssot_cache[path] = (st.st_mtime_ns, st.st_size, text)
+        return text
+
+    def _get_git_repo(self):
+        """pygit2 Repository for the project (lazy), or None if unavailable"""
+        if self._git_repo is None:
+            self._git_repo = False
+            try:
+                import pygit2
+                repo_path = pygit2.discover_repository(str(self.project_root))
+                if repo_path:
+                    self._git_repo = pygit2.Repository(repo_path)
+            except ImportError:
+                pass
+            except Exception as e:
+                print(f"[Context] pygit2 unavailable, using git CLI: {e}")
+        return self._git_repo or None
+
     def _get_recent_changes(self) -> str:
-        """Get recent changes (git diff) - fast version"""
+        """Get recent changes (git status) - in-process via pygit2 when installed"""
+        repo = self._get_git_repo()
+        if repo is not None:
+            try:
+                status = repo.status()
+                if not status:
+                    return "(No changes)"
+                lines = [f"{_short_status(flags)} {path}"
+                         for path, flags in sorted(status.items())]
+                return '\n'.join(lines)[:300]
+            except Exception:
+                pass  # Fall back to the git CLI
+
         import subprocess
 
         try:
@@ -159,36 +272,28 @@ class ContextBuilder:
         # Project state (SSOT)
         project_state = self._read_ssot()
 
-        # Recent conversation (N turns only)
-        recent_turns = self.memory.get_recent_turns(
-            limit=self.config.get("context", {}).get("max_recent_turns", 5)
+        # Recent conversation (N turns only) + open issues, one DB round trip
+        turn_roles, turn_contents, open_issues = self.memory.get_context_bundle(
+            limit_turns=self._max_recent_turns
         )
 
-        # Open issues
-        open_issues = self.memory.get_open_issues()
-
         # Recent changes
         recent_changes = self._get_recent_changes()
 
         # Related files
         related_files = self._get_related_files(
             query=query,
-            max_files=self.config.get("context", {}).get("max_related_files", 10)
+            max_files=self._max_related_files
         )
 
         return ContextPack(
             project_state=project_state,
             current_task=task,
             related_files=related_files,
-            recent_turns=[{
-                "role": t.role,
-                "content": t.content
-            } for t in recent_turns],
-            open_issues=[{
-                "severity": i.severity,
-                "title": i.title
-            } for i in open_issues],
-            recent_changes=recent_changes
+            open_issues=open_issues,
+            recent_changes=recent_changes,
+            turn_roles=turn_roles,
+            turn_contents=turn_contents
         )
 
 
@@ -216,7 +321,8 @@ if __name__ == "__main__":
     print("  MADORO CODE Context Builder Test")
     print("=" * 60)
 
-    builder = ContextBuilder(".")
+    from paths import get_exe_path
+    builder = ContextBuilder(os.environ.get("MADORO_CODE_BASE") or get_exe_path())
 
     print("\n[1] Building context pack...")
     pack = builder.build(task="Test context generation")
@@ -225,7 +331,7 @@ if __name__ == "__main__":
     print(f"  Project state: {len(pack.project_state)} chars")
     print(f"  Current task: {pack.current_task}")
     print(f"  Related files: {len(pack.related_files)}")
-    print(f"  Recent turns: {len(pack.recent_turns)}")
+    print(f"  Recent turns: {len(pack.turn_roles)}")
     print(f"  Open issues: {len(pack.open_issues)}")
 
     print("\n[3] Generated Prompt Preview:")
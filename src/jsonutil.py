@@ -0,0 +1,35 @@
+"""
+MADORO CODE - JSON helpers
+
+orjson when installed (C implementation, UTF-8 output), stdlib json otherwise.
+Both paths keep non-ASCII text as-is, like json.dumps(..., ensure_ascii=False).
+"""
+
+import json
+
+try:
+    import orjson
+
+    loads = orjson.loads
+
+    def dumps_bytes(obj) -> bytes:
+        # Non-str dict keys are stringified, as stdlib json does
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    def dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+    def dumps_pretty_bytes(obj) -> bytes:
+        # 2-space indent for files people may open by hand
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    loads = json.loads
+
+    def dumps_bytes(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    def dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+    def dumps_pretty_bytes(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
@@ -5,25 +5,243 @@ LLM is a worker, not a memory storage.
 """
 
 import os
-import requests
+import sys
+import atexit
+import time
+import threading
 import json
-import yaml
 import re
-from typing import Optional, List, Dict, Any
+import copy
+import importlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Callable, Tuple, TYPE_CHECKING
 from dataclasses import dataclass, field
 from pathlib import Path
 
+# requests / yaml are imported where first used: the config sidecar usually skips
+# YAML entirely, and API-only sessions never open the Ollama HTTP session
+if TYPE_CHECKING:
+    import requests
+
+# orjson when installed - Ollama bodies, tool call JSON, config sidecar
+from jsonutil import loads as _json_loads, dumps as _json_dumps, dumps_bytes as _json_dumps_bytes
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Process-wide requests.Session (shared by every LLMClient, survives reset_llm_client)
+# Ollama serves plain-text HTTP/1.1 only (no h2c), so an HTTP/2 client would not
+# multiplex anything here; overlapping calls are covered by the pool size instead.
+_http_session: Optional["requests.Session"] = None
+_http_session_lock = threading.Lock()
+
+
+def _get_http_session() -> "requests.Session":
+    """Shared HTTP session with a connection pool for Ollama calls"""
+    global _http_session
+    session = _http_session
+    if session is not None:
+        return session
+    with _http_session_lock:
+        if _http_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            session = requests.Session()
+            # One quick retry covers a pooled socket the server has since closed
+            # (e.g. Ollama restarted); a POST that reached the server is not re-sent
+            adapter = HTTPAdapter(
+                pool_connections=10, pool_maxsize=20,
+                max_retries=Retry(total=1, backoff_factor=0.1)
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({
+                "Connection": "keep-alive",
+                "Accept-Encoding": "gzip",
+            })
+            _http_session = session
+            atexit.register(session.close)
+        return _http_session
+
+# Optional provider SDKs: module name -> module (None if not installed).
+# Imported on first use only - they are heavy and most sessions never need them.
+_SDK_MODULES: Dict[str, Any] = {}
+_sdk_lock = threading.Lock()
+
+
+def _import_sdk(module_name: str, pip_name: str):
+    """Import an optional SDK once; later calls (hit or miss) are a dict lookup"""
+    try:
+        return _SDK_MODULES[module_name]
+    except KeyError:
+        pass
+    with _sdk_lock:
+        if module_name not in _SDK_MODULES:
+            try:
+                _SDK_MODULES[module_name] = importlib.import_module(module_name)
+            except ImportError:
+                print(f"[LLM] {pip_name} package not found. pip install {pip_name}")
+                _SDK_MODULES[module_name] = None
+        return _SDK_MODULES[module_name]
+
+
+# SDK API clients shared by every LLMClient (and across reset_llm_client):
+# (provider, api_key, base_url) -> client, so each keeps one connection pool
+_SDK_CLIENTS: Dict[tuple, Any] = {}
+_sdk_clients_lock = threading.Lock()
+
+
+def _shared_sdk_client(key: tuple, factory: Callable[[], Any]):
+    """Client for key, built by factory() on first request and closed at exit"""
+    client = _SDK_CLIENTS.get(key)
+    if client is not None:
+        return client
+    with _sdk_clients_lock:
+        client = _SDK_CLIENTS.get(key)
+        if client is None:
+            client = factory()
+            _SDK_CLIENTS[key] = client
+            close = getattr(client, "close", None)
+            if close is not None:
+                atexit.register(close)
+        return client
+
+
+# Parsed config files: abspath -> (st_mtime_ns, st_size, config, models), LRU-bounded
+_YAML_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_YAML_CACHE_MAX = 32
+_yaml_cache_lock = threading.Lock()
+
+# Tool call parsing patterns (compiled once, used on every LLM response)
+_JSON_BLOCK_RE = re.compile(r'```json\s*(.*?)\s*```', re.DOTALL)
+_APPLY_RE = re.compile(r'<apply_patch>(.*?)</apply_patch>', re.DOTALL)
+_FILE_RE = re.compile(r'<file>(.*?)</file>', re.DOTALL)
+_PATH_RE = re.compile(r'<path>(.*?)</path>', re.DOTALL)
+_CONTENT_RE = re.compile(r'<content>(.*?)</content>', re.DOTALL)
+_JSON_OBJ_RE = re.compile(r'\{\s*"tool"\s*:\s*"[^"]+"\s*,\s*"args"\s*:\s*\{.*?\}\s*\}', re.DOTALL)
+
+# XML style tools with simple parameters: tool name -> parameter names
+XML_TOOLS = {
+    'read_file': ('path',),
+    'search': ('query', 'path'),
+    'run_tests': ('cmd',),
+    'list_files': ('path',),
+    'get_diff': (),
+    'update_ssot': ('updates',),
+    'git_commit': ('message', 'files'),
+    'git_push': ('remote', 'branch')
+}
+_XML_TOOL_TAGS = tuple(f'<{name}>' for name in XML_TOOLS)
+_TAG_NAME_RE = re.compile(r'[a-z_]+')
+
+
+def _find_tag(s: str, tag: str) -> Optional[str]:
+    """Text between the first <tag> and the next </tag> (None if either is missing)"""
+    open_tag = f'<{tag}>'
+    i = s.find(open_tag)
+    if i < 0:
+        return None
+    i += len(open_tag)
+    j = s.find(f'</{tag}>', i)
+    if j < 0:
+        return None
+    return s[i:j]
+
+
+def _scan_xml_tools(content: str) -> List[Dict]:
+    """Single left-to-right pass collecting XML style tool calls
+
+    Each `<` is checked once against the known tool names, so the cost does
+    not grow with the number of tools. Calls come back in the order they
+    appear; only the first block of each tool is used.
+    """
+    tool_calls = []
+    seen = set()
+    i = content.find('<')
+    while i >= 0:
+        m = _TAG_NAME_RE.match(content, i + 1)
+        name = m.group() if m else None
+        if name in XML_TOOLS and content.startswith('>', m.end()):
+            start = m.end() + 1
+            close_tag = f'</{name}>'
+            end = content.find(close_tag, start)
+            if end >= 0:
+                if name not in seen:
+                    seen.add(name)
+                    params = XML_TOOLS[name]
+                    inner = content[start:end]
+                    args = {}
+                    for param in params:
+                        value = _find_tag(inner, param)
+                        if value is not None:
+                            value = value.strip()
+                            # Try parsing if JSON array/object
+                            if value.startswith('[') or value.startswith('{'):
+                                try:
+                                    value = _json_loads(value)
+                                except ValueError:
+                                    pass
+                            args[param] = value
+                    if args or not params:
+                        tool_calls.append({"tool": name, "args": args})
+                i = content.find('<', end + len(close_tag))
+                continue
+        i = content.find('<', i + 1)
+    return tool_calls
+
+
+# Fixed usage instructions appended after the tool list
+_TOOL_USAGE = """
+To use a tool, respond with the following JSON format:
+
+```json
+{"tool": "tool_name", "args": {"parameter": "value"}}
+```
+
+Example - Read file:
+```json
+{"tool": "read_file", "args": {"path": "README.md"}}
+```
+
+Example - Create/modify file (IMPORTANT!):
+```json
+{"tool": "apply_patch", "args": {"files": [{"path": "schema.py", "content": "# Schema content here\\nclass User:\\n    pass"}]}}
+```
+
+Example - Git commit:
+```json
+{"tool": "git_commit", "args": {"message": "Add schema file"}}
+```
 
-@dataclass
+ALWAYS use apply_patch tool when creating or modifying files.
+If no tool is needed, respond with plain text.
+"""
+
+
+@lru_cache(maxsize=16)
+def _format_tools(tools_key: tuple) -> str:
+    """Tool instructions for ((name, description, parameters JSON), ...)"""
+    parts = ["Available tools:\n"]
+    parts.extend(
+        f"- {name}: {description}\n  Parameters: {params_json}\n"
+        for name, description, params_json in tools_key
+    )
+    parts.append(_TOOL_USAGE)
+    return "".join(parts)
+
+
+@dataclass(slots=True)
 class LLMResponse:
     """LLM Response"""
     content: str
     model: str
     tokens_used: int
-    tool_calls: List[Dict] = None
+    tool_calls: Optional[List[Dict]] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ModelConfig:
     """Model Configuration"""
     name: str
@@ -39,47 +257,142 @@ class ModelConfig:
 class LLMClient:
     """Unified LLM Client - Supports Ollama, DeepSeek, Claude"""
 
-    def __init__(self, config_path: str = None):
-        if config_path is None:
+    CONNECTION_CACHE_TTL = 5.0  # Seconds a check_connection() result is reused
+    TAGS_CACHE_TTL = 60.0  # Seconds the Ollama /api/tags list is reused in-process
+    TAGS_DISK_CACHE_MAX_AGE = 24 * 3600  # Disk copy served (then refreshed) if younger
+    TAGS_DISK_CACHE_PATH = Path.home() / ".madoro" / "cache" / "ollama-tags.json"
+
+    # API provider -> environment variable consulted when config has no key
+    API_KEY_ENV = {
+        "deepseek": "DEEPSEEK_API_KEY",
+        "anthropic": "ANTHROPIC_API_KEY",
+        "google": "GOOGLE_API_KEY",
+    }
+
+    def __init__(self, config_path: str = None, verbose: bool = None):
+        # Per-call console diagnostics; off by default when there is no console
+        # (PyInstaller --windowed leaves sys.stdout as None)
+        self.verbose = sys.stdout is not None if verbose is None else verbose
+
+        # Resolve the config path with a single stat(), reused by _load_config
+        st = None
+        if config_path is not None:
+            path = Path(config_path)
+        else:
             # Priority: environment variable > current directory > relative path
             base_path = os.environ.get('MADORO_CODE_BASE')
             if base_path:
-                config_path = Path(base_path) / "config" / "models.yaml"
+                path = Path(base_path) / "config" / "models.yaml"
             else:
                 # 현재 작업 디렉토리 기준
-                cwd_config = Path.cwd() / "config" / "models.yaml"
-                if cwd_config.exists():
-                    config_path = cwd_config
-                else:
-                    config_path = Path(__file__).parent.parent / "config" / "models.yaml"
-
-        self.config = self._load_config(config_path)
-        print(f"[LLM] Config loaded from: {config_path}")
-        print(f"[LLM] Config exists: {Path(config_path).exists()}")
-        self.models = self._parse_models()
+                path = Path.cwd() / "config" / "models.yaml"
+                try:
+                    st = path.stat()
+                except OSError:
+                    path = Path(__file__).parent.parent / "config" / "models.yaml"
+        if st is None:
+            try:
+                st = path.stat()
+            except OSError:
+                pass
+
+        self.config, self.models = self._load_config(path, st)
+        print(f"[LLM] Config loaded from: {path}")
+        print(f"[LLM] Config exists: {st is not None}")
         self.current_model = self.config.get("default_model", "qwen-coder")
+        self._current_config = self.models.get(self.current_model)  # Updated by set_model
 
         # Ollama settings
         self.ollama_url = self.config.get("ollama", {}).get("base_url", "http://127.0.0.1:11434")
         self.timeout = self.config.get("ollama", {}).get("timeout", 120)
+        self.keep_alive = self.config.get("ollama", {}).get("keep_alive", "30m")
+
+        # (tool definition list, rendered instructions) for the last tool set used
+        self._tool_desc_cache: Optional[tuple] = None
 
         # API clients (lazy loading)
         self._openai_client = None
         self._anthropic_client = None
-        self._gemini_model = None
-
-    def _load_config(self, config_path) -> Dict:
-        """Load configuration file"""
-        path = Path(config_path) if not isinstance(config_path, Path) else config_path
-        if path.exists():
-            with open(path, "r", encoding="utf-8") as f:
-                return yaml.safe_load(f)
-        return {"models": {}, "default_model": "qwen-coder"}
+        self._gemini_model: Optional[tuple] = None  # (model name, GenerativeModel)
+
+        # provider -> resolved API key (only found keys are remembered)
+        self._api_keys: Dict[str, str] = {}
+
+        # model key -> (connected, expires_at monotonic)
+        self._connection_cache: Dict[str, tuple] = {}
+        # (installed Ollama model names, expires_at monotonic, name set, base name set)
+        self._tags_cache: Optional[tuple] = None
+
+    @property
+    def _session(self) -> "requests.Session":
+        """Shared HTTP session, created (and requests imported) on first Ollama call"""
+        return _get_http_session()
+
+    def _load_config(self, path: Path,
+                     st: Optional[os.stat_result]) -> Tuple[Dict, Dict[str, ModelConfig]]:
+        """Load configuration file and its parsed models (st: None if it is missing)
+
+        The model table is shared between clients built from the same file
+        version - ModelConfig is frozen and nothing adds or removes entries.
+        """
+        if st is None:
+            return {"models": {}, "default_model": "qwen-coder"}, {}
+
+        key = os.path.abspath(path)
+        with _yaml_cache_lock:
+            cached = _YAML_CACHE.get(key)
+            if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                _YAML_CACHE.move_to_end(key)
+                # Callers may mutate their config - never hand out the cached dict
+                return copy.deepcopy(cached[2]), cached[3]
+
+            config = self._load_config_file(path, st)
+            models = self._parse_models(config)
+            _YAML_CACHE[key] = (st.st_mtime_ns, st.st_size, config, models)
+            _YAML_CACHE.move_to_end(key)
+            if len(_YAML_CACHE) > _YAML_CACHE_MAX:
+                _YAML_CACHE.popitem(last=False)
+        return copy.deepcopy(config), models
+
+    def _load_config_file(self, path: Path, st: os.stat_result) -> Dict:
+        """Parse the YAML config, via a JSON sidecar written on first parse
+
+        `models.yaml.json` records the (mtime_ns, size) of the YAML it was
+        built from and is used only while those still match, so edits (e.g.
+        from the settings dialog) are picked up on the next load.
+        """
+        sidecar = path.with_name(path.name + ".json")
+        source = [st.st_mtime_ns, st.st_size]
+        try:
+            cached = _json_loads(sidecar.read_bytes())
+            if cached.get("source") == source:
+                return cached["config"]
+        except (OSError, ValueError, AttributeError, KeyError):
+            pass
+
+        import yaml
+        # libyaml C loader when available (several times faster than the pure-Python one)
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        with open(path, "rb") as f:
+            config = yaml.load(f, Loader=loader)
+
+        # Write-then-rename so a concurrent start never reads a partial file
+        tmp = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_bytes(_json_dumps_bytes({"source": source, "config": config}))
+            os.replace(tmp, sidecar)
+        except (OSError, TypeError, ValueError):
+            # Read-only bundle dir or non-JSON YAML values - parse YAML next time
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+        return config
 
-    def _parse_models(self) -> Dict[str, ModelConfig]:
+    def _parse_models(self, config: Dict) -> Dict[str, ModelConfig]:
         """Parse model configuration"""
         models = {}
-        for key, cfg in self.config.get("models", {}).items():
+        for key, cfg in config.get("models", {}).items():
             models[key] = ModelConfig(
                 name=cfg.get("name", key),
                 display_name=cfg.get("display_name", key),
@@ -92,103 +405,96 @@ class LLMClient:
             )
         return models
 
+    def _get_api_key(self, provider: str) -> Optional[str]:
+        """API key for a provider: config first, then its environment variable"""
+        api_key = self._api_keys.get(provider)
+        if api_key:
+            return api_key
+        api_key = (
+            self.config.get("api", {}).get(provider, {}).get("api_key") or
+            os.environ.get(self.API_KEY_ENV[provider])
+        )
+        if api_key:
+            self._api_keys[provider] = api_key
+        return api_key
+
     def _get_deepseek_client(self):
         """DeepSeek client (OpenAI compatible)"""
         if self._openai_client is None:
-            try:
-                from openai import OpenAI
-                api_key = (
-                    self.config.get("api", {}).get("deepseek", {}).get("api_key") or
-                    os.environ.get("DEEPSEEK_API_KEY")
+            openai = _import_sdk("openai", "openai")
+            api_key = self._get_api_key("deepseek")
+            if openai is not None and api_key:
+                base_url = "https://api.deepseek.com"
+                self._openai_client = _shared_sdk_client(
+                    ("deepseek", api_key, base_url),
+                    lambda: openai.OpenAI(api_key=api_key, base_url=base_url)
                 )
-                if api_key:
-                    self._openai_client = OpenAI(
-                        api_key=api_key,
-                        base_url="https://api.deepseek.com"
-                    )
-            except ImportError:
-                print("[LLM] openai package not found. pip install openai")
         return self._openai_client
 
     def _get_anthropic_client(self):
         """Anthropic client"""
         if self._anthropic_client is None:
-            try:
-                import anthropic
-                api_key = (
-                    self.config.get("api", {}).get("anthropic", {}).get("api_key") or
-                    os.environ.get("ANTHROPIC_API_KEY")
+            anthropic = _import_sdk("anthropic", "anthropic")
+            api_key = self._get_api_key("anthropic")
+            if anthropic is not None and api_key:
+                self._anthropic_client = _shared_sdk_client(
+                    ("anthropic", api_key, None),
+                    lambda: anthropic.Anthropic(api_key=api_key, timeout=120.0)
                 )
-                if api_key:
-                    self._anthropic_client = anthropic.Anthropic(
-                        api_key=api_key,
-                        timeout=120.0
-                    )
-            except ImportError:
-                print("[LLM] anthropic package not found. pip install anthropic")
         return self._anthropic_client
 
     def _get_gemini_client(self, model_name: str):
-        """Google Gemini client"""
-        try:
-            import google.generativeai as genai
-            api_key = (
-                self.config.get("api", {}).get("google", {}).get("api_key") or
-                os.environ.get("GOOGLE_API_KEY")
-            )
-            if api_key:
-                genai.configure(api_key=api_key)
-                return genai.GenerativeModel(model_name)
-        except ImportError:
-            print("[LLM] google-generativeai package not found. pip install google-generativeai")
-        return None
+        """Google Gemini client (reused while the same model is requested)"""
+        if self._gemini_model is not None and self._gemini_model[0] == model_name:
+            return self._gemini_model[1]
+        genai = _import_sdk("google.generativeai", "google-generativeai")
+        api_key = self._get_api_key("google")
+        if genai is None or not api_key:
+            return None
+        genai.configure(api_key=api_key)
+        model = genai.GenerativeModel(model_name)
+        self._gemini_model = (model_name, model)
+        return model
 
     def set_model(self, model_key: str) -> bool:
         """Select model"""
         if model_key in self.models:
             self.current_model = model_key
+            self._current_config = self.models[model_key]
             return True
         return False
 
     def get_model_config(self) -> Optional[ModelConfig]:
         """Get current model configuration"""
-        return self.models.get(self.current_model)
+        return self._current_config
 
     def list_models(self) -> List[str]:
         """List available models"""
         return list(self.models.keys())
 
     def check_connection(self) -> bool:
-        """Check connection (based on current model)"""
+        """Check connection (based on current model, cached for a few seconds)"""
         model_cfg = self.get_model_config()
         if not model_cfg:
             return False
 
+        now = time.monotonic()
+        cached = self._connection_cache.get(self.current_model)
+        if cached and cached[1] > now:
+            return cached[0]
+
+        connected = self._check_connection(model_cfg)
+        self._connection_cache[self.current_model] = (connected, now + self.CONNECTION_CACHE_TTL)
+        return connected
+
+    def _check_connection(self, model_cfg: ModelConfig) -> bool:
+        """Check connection for a model config (uncached)"""
         if model_cfg.provider == "ollama":
-            try:
-                resp = requests.get(f"{self.ollama_url}/api/tags", timeout=5)
-                return resp.status_code == 200
-            except:
-                return False
-        elif model_cfg.provider == "deepseek":
+            # /api/tags doubles as the liveness probe and primes the tags cache
+            return self._fetch_ollama_tags() is not None
+        elif model_cfg.provider in self.API_KEY_ENV:
             # Consider connected if API key exists
-            api_key = (
-                self.config.get("api", {}).get("deepseek", {}).get("api_key") or
-                os.environ.get("DEEPSEEK_API_KEY")
-            )
-            return bool(api_key)
-        elif model_cfg.provider == "anthropic":
-            api_key = (
-                self.config.get("api", {}).get("anthropic", {}).get("api_key") or
-                os.environ.get("ANTHROPIC_API_KEY")
-            )
-            return bool(api_key)
-        elif model_cfg.provider == "google":
-            api_key = (
-                self.config.get("api", {}).get("google", {}).get("api_key") or
-                os.environ.get("GOOGLE_API_KEY")
-            )
-            return bool(api_key)
+            return bool(self._get_api_key(model_cfg.provider))
         return False
 
     def check_model_available(self, model_key: str = None) -> bool:
@@ -199,16 +505,18 @@ class LLMClient:
             return False
 
         if model_cfg.provider == "ollama":
-            try:
-                resp = requests.get(f"{self.ollama_url}/api/tags", timeout=5)
-                if resp.status_code == 200:
-                    data = resp.json()
-                    available = [m["name"] for m in data.get("models", [])]
-                    return (model_cfg.ollama_model in available or
-                            model_cfg.ollama_model.split(":")[0] in [m.split(":")[0] for m in available])
-            except:
-                pass
-            return False
+            # Installed if the exact name or its base name (before ":") is in the
+            # tag list. A fresh tag list answers for free; otherwise /api/show
+            # confirms an exact match in one call, and only a miss lists the tags.
+            target = model_cfg.ollama_model
+            if self._tags_cache is None or self._tags_cache[1] <= time.monotonic():
+                shown = self._show_ollama_model(target)
+                if shown is not False:
+                    return bool(shown)  # True, or None: Ollama unreachable
+                if self._fetch_ollama_tags() is None:
+                    return False
+            _, _, names, bases = self._tags_cache
+            return target in names or target.split(":", 1)[0] in bases
         elif model_cfg.provider == "deepseek":
             return self._get_deepseek_client() is not None
         elif model_cfg.provider == "anthropic":
@@ -217,32 +525,134 @@ class LLMClient:
             return self._get_gemini_client(model_cfg.api_model) is not None
         return False
 
-    def generate(self, prompt: str, system: str = None) -> LLMResponse:
-        """Generate text - route by provider"""
+    def _show_ollama_model(self, ollama_model: str) -> Optional[bool]:
+        """One /api/show round trip: True on 200, False on 404, None if unreachable"""
+        try:
+            resp = self._session.post(
+                f"{self.ollama_url}/api/show",
+                data=_json_dumps_bytes({"name": ollama_model}),
+                headers=_JSON_HEADERS,
+                timeout=5,
+            )
+            if resp.status_code == 200:
+                return True
+            return False if resp.status_code == 404 else None
+        except Exception:
+            return None
+
+    def list_ollama_tags(self) -> Optional[List[str]]:
+        """Installed Ollama model names (None if Ollama is unreachable)
+
+        Memoized for TAGS_CACHE_TTL seconds. On a cold start a disk copy younger
+        than TAGS_DISK_CACHE_MAX_AGE is returned immediately and refreshed in
+        the background (stale-while-revalidate).
+        """
+        now = time.monotonic()
+        if self._tags_cache is not None:
+            if self._tags_cache[1] > now:
+                return self._tags_cache[0]
+        else:
+            tags = self._read_tags_disk_cache()
+            if tags is not None:
+                self._set_tags_cache(tags)
+                threading.Thread(target=self._fetch_ollama_tags, daemon=True).start()
+                return tags
+        return self._fetch_ollama_tags()
+
+    def _fetch_ollama_tags(self) -> Optional[List[str]]:
+        """Fetch /api/tags and refresh the in-process and disk caches"""
+        try:
+            resp = self._session.get(f"{self.ollama_url}/api/tags", timeout=5)
+            if resp.status_code != 200:
+                return None
+            tags = [m["name"] for m in _json_loads(resp.content).get("models", [])]
+        except Exception:
+            return None
+
+        self._set_tags_cache(tags)
+        try:
+            self.TAGS_DISK_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            self.TAGS_DISK_CACHE_PATH.write_bytes(_json_dumps_bytes(tags))
+        except OSError:
+            pass
+        return tags
+
+    def _set_tags_cache(self, tags: List[str]):
+        """Remember the tag list with lookup sets for check_model_available()"""
+        self._tags_cache = (
+            tags,
+            time.monotonic() + self.TAGS_CACHE_TTL,
+            frozenset(tags),
+            frozenset(m.split(":", 1)[0] for m in tags),
+        )
+
+    def _read_tags_disk_cache(self) -> Optional[List[str]]:
+        """Read the persisted tag list if it is fresh enough"""
+        try:
+            age = time.time() - self.TAGS_DISK_CACHE_PATH.stat().st_mtime
+            if age > self.TAGS_DISK_CACHE_MAX_AGE:
+                return None
+            tags = _json_loads(self.TAGS_DISK_CACHE_PATH.read_bytes())
+        except (OSError, ValueError):
+            return None
+        # A corrupt or hand-edited file is ignored rather than breaking _set_tags_cache
+        if isinstance(tags, list) and all(isinstance(t, str) for t in tags):
+            return tags
+        return None
+
+    def generate(self, prompt: str, system: str = None,
+                 on_chunk: Callable[[str], None] = None) -> LLMResponse:
+        """Generate text - route by provider
+
+        on_chunk, if given, receives text fragments as they arrive on providers
+        that support streaming (Ollama, DeepSeek, Claude); Gemini ignores it.
+        """
         model_cfg = self.get_model_config()
         if not model_cfg:
             raise ValueError(f"Unknown model: {self.current_model}")
 
-        print(f"[LLM] Provider: {model_cfg.provider}, Model: {model_cfg.display_name}")
-        print(f"[LLM] Prompt: {len(prompt)} chars")
+        if self.verbose:
+            print(f"[LLM] Provider: {model_cfg.provider}, Model: {model_cfg.display_name}\n"
+                  f"[LLM] Prompt: {len(prompt)} chars")
 
         if model_cfg.provider == "ollama":
-            return self._generate_ollama(prompt, system, model_cfg)
+            return self._generate_ollama(prompt, system, model_cfg, on_chunk)
         elif model_cfg.provider == "deepseek":
-            return self._generate_deepseek(prompt, system, model_cfg)
+            return self._generate_deepseek(prompt, system, model_cfg, on_chunk)
         elif model_cfg.provider == "anthropic":
-            return self._generate_anthropic(prompt, system, model_cfg)
+            return self._generate_anthropic(prompt, system, model_cfg, on_chunk)
         elif model_cfg.provider == "google":
             return self._generate_gemini(prompt, system, model_cfg)
         else:
             raise ValueError(f"Unknown provider: {model_cfg.provider}")
 
-    def _generate_ollama(self, prompt: str, system: str, model_cfg: ModelConfig) -> LLMResponse:
-        """Ollama generation"""
+    def preload(self) -> bool:
+        """Load the current Ollama model into memory (no-op for API providers)
+
+        An empty-prompt /api/generate returns once the model is resident, and
+        keep_alive restarts its unload timer.
+        """
+        model_cfg = self.get_model_config()
+        if not model_cfg or model_cfg.provider != "ollama":
+            return False
+        payload = {"model": model_cfg.ollama_model}
+        if self.keep_alive:
+            payload["keep_alive"] = self.keep_alive
+        try:
+            resp = self._session.post(f"{self.ollama_url}/api/generate",
+                                      data=_json_dumps_bytes(payload),
+                                      headers=_JSON_HEADERS, timeout=self.timeout)
+            return resp.status_code == 200
+        except Exception:
+            return False
+
+    def _generate_ollama(self, prompt: str, system: str, model_cfg: ModelConfig,
+                         on_chunk: Callable[[str], None] = None) -> LLMResponse:
+        """Ollama generation (always streamed; on_chunk, if set, sees each fragment)"""
         payload = {
             "model": model_cfg.ollama_model,
             "prompt": prompt,
-            "stream": False,
+            "stream": True,
             "options": {
                 "temperature": model_cfg.temperature,
                 "num_ctx": model_cfg.context_length
@@ -250,27 +660,51 @@ class LLMClient:
         }
         if system:
             payload["system"] = system
+        if self.keep_alive:
+            payload["keep_alive"] = self.keep_alive
 
         try:
-            resp = requests.post(
+            resp = self._session.post(
                 f"{self.ollama_url}/api/generate",
-                json=payload,
-                timeout=self.timeout
+                data=_json_dumps_bytes(payload),
+                headers=_JSON_HEADERS,
+                timeout=self.timeout,
+                stream=True
             )
             resp.raise_for_status()
-            data = resp.json()
+
+            # One JSON object per line, last one has done=true
+            parts = []
+            tokens_used = 0
+            with resp:
+                for line in resp.iter_lines():
+                    if not line:
+                        continue
+                    data = _json_loads(line)
+                    if "error" in data:
+                        raise RuntimeError(data["error"])
+                    piece = data.get("response", "")
+                    if piece:
+                        parts.append(piece)
+                        if on_chunk is not None:
+                            on_chunk(piece)
+                    if data.get("done"):
+                        tokens_used = data.get("eval_count", 0)
+                        break
             return LLMResponse(
-                content=data.get("response", ""),
+                content="".join(parts),
                 model=model_cfg.name,
-                tokens_used=data.get("eval_count", 0)
+                tokens_used=tokens_used
             )
-        except requests.exceptions.Timeout:
-            raise TimeoutError("Ollama response timeout")
         except Exception as e:
+            import requests  # Already loaded by the session at this point
+            if isinstance(e, requests.exceptions.Timeout):
+                raise TimeoutError("Ollama response timeout")
             raise RuntimeError(f"Ollama call failed: {e}")
 
-    def _generate_deepseek(self, prompt: str, system: str, model_cfg: ModelConfig) -> LLMResponse:
-        """DeepSeek API generation"""
+    def _generate_deepseek(self, prompt: str, system: str, model_cfg: ModelConfig,
+                           on_chunk: Callable[[str], None] = None) -> LLMResponse:
+        """DeepSeek API generation (streamed when on_chunk is set)"""
         client = self._get_deepseek_client()
         if not client:
             raise RuntimeError("DeepSeek API key not set. Set DEEPSEEK_API_KEY environment variable.")
@@ -281,6 +715,32 @@ class LLMClient:
         messages.append({"role": "user", "content": prompt})
 
         try:
+            if on_chunk is not None:
+                stream = client.chat.completions.create(
+                    model=model_cfg.api_model,
+                    messages=messages,
+                    temperature=model_cfg.temperature,
+                    max_tokens=4096,
+                    stream=True,
+                    # Usage arrives in a final chunk with no choices
+                    extra_body={"stream_options": {"include_usage": True}}
+                )
+                parts = []
+                tokens_used = 0
+                for chunk in stream:
+                    if chunk.choices:
+                        piece = chunk.choices[0].delta.content
+                        if piece:
+                            parts.append(piece)
+                            on_chunk(piece)
+                    if chunk.usage:
+                        tokens_used = chunk.usage.total_tokens
+                return LLMResponse(
+                    content="".join(parts),
+                    model=model_cfg.name,
+                    tokens_used=tokens_used
+                )
+
             response = client.chat.completions.create(
                 model=model_cfg.api_model,
                 messages=messages,
@@ -295,13 +755,15 @@ class LLMClient:
         except Exception as e:
             raise RuntimeError(f"DeepSeek API call failed: {e}")
 
-    def _generate_anthropic(self, prompt: str, system: str, model_cfg: ModelConfig) -> LLMResponse:
-        """Claude API generation"""
+    def _generate_anthropic(self, prompt: str, system: str, model_cfg: ModelConfig,
+                            on_chunk: Callable[[str], None] = None) -> LLMResponse:
+        """Claude API generation (streamed when on_chunk is set)"""
         client = self._get_anthropic_client()
         if not client:
             raise RuntimeError("Anthropic API key not set. Set ANTHROPIC_API_KEY environment variable.")
 
-        print(f"[LLM] Claude API call starting... (model: {model_cfg.api_model})")
+        if self.verbose:
+            print(f"[LLM] Claude API call starting... (model: {model_cfg.api_model})")
 
         try:
             kwargs = {
@@ -313,18 +775,26 @@ class LLMClient:
             if system:
                 kwargs["system"] = system
 
-            response = client.messages.create(**kwargs)
+            if on_chunk is not None:
+                with client.messages.stream(**kwargs) as stream:
+                    for piece in stream.text_stream:
+                        on_chunk(piece)
+                    response = stream.get_final_message()
+            else:
+                response = client.messages.create(**kwargs)
 
             content = ""
             if response.content:
                 content = response.content[0].text
 
-            print(f"[LLM] Claude API 응답 완료 (tokens: {response.usage.input_tokens + response.usage.output_tokens if response.usage else 0})")
+            tokens_used = response.usage.input_tokens + response.usage.output_tokens if response.usage else 0
+            if self.verbose:
+                print(f"[LLM] Claude API 응답 완료 (tokens: {tokens_used})")
 
             return LLMResponse(
                 content=content,
                 model=model_cfg.name,
-                tokens_used=response.usage.input_tokens + response.usage.output_tokens if response.usage else 0
+                tokens_used=tokens_used
             )
         except TimeoutError as e:
             print(f"[LLM] Claude API timeout: {e}")
@@ -339,7 +809,8 @@ class LLMClient:
         if not client:
             raise RuntimeError("Google API key not set. Set GOOGLE_API_KEY environment variable or configure in Settings.")
 
-        print(f"[LLM] Gemini API call starting... (model: {model_cfg.api_model})")
+        if self.verbose:
+            print(f"[LLM] Gemini API call starting... (model: {model_cfg.api_model})")
 
         try:
             # Combine system prompt with user prompt
@@ -349,12 +820,15 @@ class LLMClient:
 
             response = client.generate_content(full_prompt)
 
-            content = response.text if response.text else ""
+            content = response.text or ""
 
-            # Estimate tokens (Gemini doesn't always return exact count)
-            tokens_used = len(full_prompt.split()) + len(content.split())
+            # Exact count when the SDK reports usage, else a ~4 chars/token estimate
+            usage = getattr(response, "usage_metadata", None)
+            tokens_used = getattr(usage, "total_token_count", 0) or \
+                max(1, (len(full_prompt) + len(content)) // 4)
 
-            print(f"[LLM] Gemini API response complete (estimated tokens: {tokens_used})")
+            if self.verbose:
+                print(f"[LLM] Gemini API response complete (estimated tokens: {tokens_used})")
 
             return LLMResponse(
                 content=content,
@@ -365,41 +839,16 @@ class LLMClient:
             print(f"[LLM] Gemini API error: {e}")
             raise RuntimeError(f"Gemini API call failed: {e}")
 
-    def generate_with_tools(self, prompt: str, tools: List[Dict], system: str = None) -> LLMResponse:
-        """Generate with tool calls"""
-        tool_desc = "Available tools:\n"
-        for tool in tools:
-            tool_desc += f"- {tool['name']}: {tool['description']}\n"
-            tool_desc += f"  Parameters: {json.dumps(tool.get('parameters', {}), ensure_ascii=False)}\n"
-
-        tool_desc += """
-To use a tool, respond with the following JSON format:
-
-```json
-{"tool": "tool_name", "args": {"parameter": "value"}}
-```
-
-Example - Read file:
-```json
-{"tool": "read_file", "args": {"path": "README.md"}}
-```
-
-Example - Create/modify file (IMPORTANT!):
-```json
-{"tool": "apply_patch", "args": {"files": [{"path": "schema.py", "content": "# Schema content here\\nclass User:\\n    pass"}]}}
-```
-
-Example - Git commit:
-```json
-{"tool": "git_commit", "args": {"message": "Add schema file"}}
-```
-
-ALWAYS use apply_patch tool when creating or modifying files.
-If no tool is needed, respond with plain text.
-"""
+    def generate_with_tools(self, prompt: str, tools: List[Dict], system: str = None,
+                            on_chunk: Callable[[str], None] = None) -> LLMResponse:
+        """Generate with tool calls (tool JSON is parsed after the full response)"""
+        # Same tool list -> byte-identical system prompt (keeps Ollama's prefix cache valid)
+        if self._tool_desc_cache is None or self._tool_desc_cache[0] is not tools:
+            self._tool_desc_cache = (tools, self._render_tool_desc(tools))
+        tool_desc = self._tool_desc_cache[1]
 
         combined_system = f"{system}\n\n{tool_desc}" if system else tool_desc
-        response = self.generate(prompt, system=combined_system)
+        response = self.generate(prompt, system=combined_system, on_chunk=on_chunk)
 
         # Parse tool calls
         tool_calls = self._parse_tool_calls(response.content)
@@ -408,39 +857,53 @@ If no tool is needed, respond with plain text.
 
         return response
 
+    def _render_tool_desc(self, tools: List[Dict]) -> str:
+        """Render tool instructions appended to the system prompt"""
+        tools_key = tuple(
+            (tool['name'], tool['description'], _json_dumps(tool.get('parameters', {})))
+            for tool in tools
+        )
+        return _format_tools(tools_key)
+
     def _parse_tool_calls(self, content: str) -> Optional[List[Dict]]:
         """Parse tool calls from response"""
+        # Plain text answers are the common case - skip every regex pass for them
+        has_json_block = '```json' in content
+        has_apply = '<apply_patch>' in content
+        has_tool_key = '"tool"' in content
+        has_xml_tool = any(tag in content for tag in _XML_TOOL_TAGS)
+        if not (has_json_block or has_apply or has_tool_key or has_xml_tool):
+            return None
+
         tool_calls = []
 
         # 1. Parse ```json format (highest priority)
-        json_pattern = r'```json\s*(.*?)\s*```'
-        matches = re.findall(json_pattern, content, re.DOTALL)
-        for match in matches:
-            try:
-                data = json.loads(match)
-                # Handle JSON array format
-                if isinstance(data, list):
-                    for item in data:
-                        if isinstance(item, dict) and "tool" in item:
-                            tool_calls.append(item)
-                # Handle single object format
-                elif isinstance(data, dict) and "tool" in data:
-                    tool_calls.append(data)
-            except:
-                pass
+        if has_json_block:
+            for match in _JSON_BLOCK_RE.findall(content):
+                try:
+                    data = _json_loads(match)
+                    # Handle JSON array format
+                    if isinstance(data, list):
+                        for item in data:
+                            if isinstance(item, dict) and "tool" in item:
+                                tool_calls.append(item)
+                    # Handle single object format
+                    elif isinstance(data, dict) and "tool" in data:
+                        tool_calls.append(data)
+                except:
+                    pass
 
         # 2. Dedicated apply_patch parsing (file creation/modification)
-        if not tool_calls:
+        if not tool_calls and has_apply:
             # Pattern: <apply_patch> ... </apply_patch> containing JSON or file info
-            apply_pattern = r'<apply_patch>(.*?)</apply_patch>'
-            apply_match = re.search(apply_pattern, content, re.DOTALL)
+            apply_match = _APPLY_RE.search(content)
             if apply_match:
                 inner = apply_match.group(1).strip()
                 files = []
 
                 # Method 1: JSON array inside
                 try:
-                    parsed = json.loads(inner)
+                    parsed = _json_loads(inner)
                     if isinstance(parsed, list):
                         files = parsed
                     elif isinstance(parsed, dict) and "files" in parsed:
@@ -450,16 +913,14 @@ If no tool is needed, respond with plain text.
 
                 # Method 2: Wrapped in <file> tags
                 if not files:
-                    file_pattern = r'<file>(.*?)</file>'
-                    file_matches = re.findall(file_pattern, inner, re.DOTALL)
-                    for fm in file_matches:
+                    for fm in _FILE_RE.findall(inner):
                         try:
-                            file_data = json.loads(fm)
+                            file_data = _json_loads(fm)
                             files.append(file_data)
                         except:
                             # Extract path and content directly
-                            path_match = re.search(r'<path>(.*?)</path>', fm, re.DOTALL)
-                            content_match = re.search(r'<content>(.*?)</content>', fm, re.DOTALL)
+                            path_match = _PATH_RE.search(fm)
+                            content_match = _CONTENT_RE.search(fm)
                             if path_match and content_match:
                                 files.append({
                                     "path": path_match.group(1).strip(),
@@ -468,8 +929,8 @@ If no tool is needed, respond with plain text.
 
                 # Method 3: Direct path/content tags
                 if not files:
-                    path_match = re.search(r'<path>(.*?)</path>', inner, re.DOTALL)
-                    content_match = re.search(r'<content>(.*?)</content>', inner, re.DOTALL)
+                    path_match = _PATH_RE.search(inner)
+                    content_match = _CONTENT_RE.search(inner)
                     if path_match and content_match:
                         files.append({
                             "path": path_match.group(1).strip(),
@@ -480,58 +941,27 @@ If no tool is needed, respond with plain text.
                     tool_calls.append({"tool": "apply_patch", "args": {"files": files}})
 
         # 3. Other XML style parsing (simple parameter tools)
-        if not tool_calls:
-            xml_tools = {
-                'read_file': ['path'],
-                'search': ['query', 'path'],
-                'run_tests': ['cmd'],
-                'list_files': ['path'],
-                'get_diff': [],
-                'update_ssot': ['updates'],
-                'git_commit': ['message', 'files'],
-                'git_push': ['remote', 'branch']
-            }
-            for tool_name, params in xml_tools.items():
-                pattern = rf'<{tool_name}>(.*?)</{tool_name}>'
-                match = re.search(pattern, content, re.DOTALL)
-                if match:
-                    inner = match.group(1)
-                    args = {}
-                    for param in params:
-                        param_pattern = rf'<{param}>(.*?)</{param}>'
-                        param_match = re.search(param_pattern, inner, re.DOTALL)
-                        if param_match:
-                            value = param_match.group(1).strip()
-                            # Try parsing if JSON array/object
-                            if value.startswith('[') or value.startswith('{'):
-                                try:
-                                    value = json.loads(value)
-                                except:
-                                    pass
-                            args[param] = value
-                    if args or not params:
-                        tool_calls.append({"tool": tool_name, "args": args})
+        if not tool_calls and has_xml_tool:
+            tool_calls.extend(_scan_xml_tools(content))
 
         # 4. Single line JSON format parsing
-        if not tool_calls:
+        if not tool_calls and has_tool_key:
             for line in content.split('\n'):
                 line = line.strip()
                 if line.startswith('{') and '"tool"' in line:
                     try:
-                        data = json.loads(line)
+                        data = _json_loads(line)
                         if "tool" in data:
                             tool_calls.append(data)
                     except:
                         pass
 
         # 5. Multiline JSON object parsing (direct JSON without code block)
-        if not tool_calls:
+        if not tool_calls and has_tool_key:
             # Find { "tool": ... } pattern
-            json_obj_pattern = r'\{\s*"tool"\s*:\s*"[^"]+"\s*,\s*"args"\s*:\s*\{.*?\}\s*\}'
-            obj_matches = re.findall(json_obj_pattern, content, re.DOTALL)
-            for obj_match in obj_matches:
+            for obj_match in _JSON_OBJ_RE.findall(content):
                 try:
-                    data = json.loads(obj_match)
+                    data = _json_loads(obj_match)
                     if "tool" in data:
                         tool_calls.append(data)
                 except:
@@ -559,17 +989,19 @@ def get_llm_client(config_path: str = None) -> LLMClient:
     if _llm_client is None:
         if config_path is None:
             # Use bundle path for config (EXE or script)
-            import os
             bundle_path = os.environ.get('MADORO_CODE_BUNDLE', '.')
             config_path = os.path.join(bundle_path, "config", "models.yaml")
         _llm_client = LLMClient(config_path)
     return _llm_client
 
 
-def reset_llm_client():
-    """Reset for testing"""
+def reset_llm_client(clear_config_cache: bool = False):
+    """Reset for testing (optionally forget parsed config files as well)"""
     global _llm_client
     _llm_client = None
+    if clear_config_cache:
+        with _yaml_cache_lock:
+            _YAML_CACHE.clear()
 
 
 # ============================================
@@ -588,10 +1020,13 @@ if __name__ == "__main__":
     print(f"  Current: {client.current_model}")
 
     print("\n[2] Model Status")
-    for model_key in client.list_models():
+    from concurrent.futures import ThreadPoolExecutor
+    model_keys = client.list_models()
+    # Probes are IO-bound and take the model key directly (no set_model), so they overlap safely
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(model_keys)))) as executor:
+        availability = dict(zip(model_keys, executor.map(client.check_model_available, model_keys)))
+    for model_key, available in availability.items():
         cfg = client.models[model_key]
-        client.set_model(model_key)
-        available = client.check_model_available(model_key)
         status = "[OK]" if available else "[--]"
         print(f"  {status} {cfg.display_name} ({cfg.provider})")
 
@@ -5,19 +5,31 @@ Memory is stored in DB/files, not in the model.
 """
 
 import sqlite3
-import json
 import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Iterator
 from dataclasses import dataclass, asdict
 
+import jsonutil
+
+
+def _now_iso() -> str:
+    """Local timestamp for DB rows (microsecond precision, ISO 8601)
+
+    Not coarsened or cached: turns and logs are read back ORDER BY timestamp,
+    so two rows written within the same millisecond must still sort apart.
+    """
+    return datetime.now().isoformat()
+
 
 # ============================================
 # Data Classes
 # ============================================
 
-@dataclass
+@dataclass(slots=True)
 class WorkLog:
     """Work log entry"""
     id: Optional[int] = None
@@ -29,7 +41,7 @@ class WorkLog:
     details: str = ""  # JSON format details
 
 
-@dataclass
+@dataclass(slots=True)
 class Issue:
     """Discovered issue"""
     id: Optional[int] = None
@@ -42,7 +54,7 @@ class Issue:
     resolution: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class FileIndex:
     """File index entry"""
     id: Optional[int] = None
@@ -53,7 +65,7 @@ class FileIndex:
     symbols: str = ""  # JSON: list of functions/classes
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationTurn:
     """Conversation turn (keep only recent N)"""
     id: Optional[int] = None
@@ -71,10 +83,90 @@ class MemoryStore:
     """Project memory storage"""
 
     DEFAULT_MAX_TURNS = 50  # Default value
-
-    def __init__(self, db_path: str = "db/memory.db", max_turns: int = None):
+    PRUNE_EVERY_TURNS = 16  # add_turn trims old turns once per this many inserts
+    MMAP_SIZE = 256 * 1024 * 1024  # SQLite memory-mapped I/O window (bytes)
+    CACHE_SIZE_KIB = 20000  # SQLite page cache (cache_size=-N means N KiB)
+    STATEMENT_CACHE_SIZE = 64  # Prepared statements kept per connection
+    BUSY_TIMEOUT_MS = 3000  # Wait this long for another connection's write lock
+    # Pragmas a project may override via its "sqlite_pragmas" setting
+    TUNABLE_PRAGMAS = frozenset({
+        "synchronous", "cache_size", "mmap_size", "temp_store", "busy_timeout",
+        "wal_autocheckpoint",
+    })
+
+    # SQL text is fixed per statement so the connection's statement cache
+    # (keyed by the SQL string) reuses the compiled plan on every call.
+    # Row SELECTs list columns in dataclass field order -> Cls(*row)
+    _SQL_INSERT_LOG = (
+        "INSERT INTO work_logs (timestamp, action, target, description, result, details) "
+        "VALUES (?, ?, ?, ?, ?, ?)"
+    )
+    _SQL_RECENT_LOGS = (
+        "SELECT id, timestamp, action, target, description, result, details "
+        "FROM work_logs ORDER BY timestamp DESC LIMIT ?"
+    )
+    _SQL_INSERT_ISSUE = (
+        "INSERT INTO issues (created_at, status, severity, title, description) "
+        "VALUES (?, 'OPEN', ?, ?, ?)"
+    )
+    _SQL_RESOLVE_ISSUE = "UPDATE issues SET status='RESOLVED', resolved_at=?, resolution=? WHERE id=?"
+    _SQL_OPEN_ISSUES = (
+        "SELECT id, created_at, status, severity, title, description, resolved_at, resolution "
+        "FROM issues WHERE status='OPEN' ORDER BY severity DESC, created_at DESC"
+    )
+    _SQL_INSERT_TURN = (
+        "INSERT INTO conversation_turns (timestamp, role, content, context_used) "
+        "VALUES (?, ?, ?, ?)"
+    )
+    # Keep the newest N: everything at or below the (N+1)-th newest id goes
+    _SQL_PRUNE_TURNS = (
+        "DELETE FROM conversation_turns WHERE id <= ("
+        "SELECT id FROM conversation_turns ORDER BY id DESC LIMIT 1 OFFSET ?)"
+    )
+    _SQL_RECENT_TURNS = (
+        "SELECT id, timestamp, role, content, context_used "
+        "FROM conversation_turns ORDER BY timestamp DESC LIMIT ?"
+    )
+    _SQL_RECENT_TURN_COLUMNS = "SELECT role, content FROM conversation_turns ORDER BY timestamp DESC LIMIT ?"
+    _SQL_CLEAR_TURNS = "DELETE FROM conversation_turns"
+    _SQL_SET_STATE = "INSERT OR REPLACE INTO state (key, value, updated_at) VALUES (?, ?, ?)"
+    _SQL_GET_STATE = "SELECT value FROM state WHERE key=?"
+    # True upsert (not INSERT OR REPLACE): the row keeps its id and the UPDATE
+    # trigger keeps file_index_fts in sync - REPLACE's implicit delete fires no trigger
+    _SQL_UPSERT_FILE_INDEX = (
+        "INSERT INTO file_index (path, last_modified, size, content_hash, symbols) "
+        "VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT(path) DO UPDATE SET last_modified=excluded.last_modified, "
+        "size=excluded.size, content_hash=excluded.content_hash, symbols=excluded.symbols"
+    )
+    _SQL_GET_FILE_INDEX = (
+        "SELECT id, path, last_modified, size, content_hash, symbols "
+        "FROM file_index WHERE path=?"
+    )
+    _SQL_SEARCH_SYMBOL = (
+        "SELECT id, path, last_modified, size, content_hash, symbols "
+        "FROM file_index WHERE symbols LIKE ?"
+    )
+    _SQL_SEARCH_SYMBOL_FTS = (
+        "SELECT f.id, f.path, f.last_modified, f.size, f.content_hash, f.symbols "
+        "FROM file_index f JOIN file_index_fts x ON x.rowid = f.id "
+        "WHERE file_index_fts MATCH ?"
+    )
+
+    def __init__(self, db_path: str = "db/memory.db", max_turns: int = None,
+                 pragmas: Dict[str, Any] = None):
         self.db_path = db_path
         self.max_turns = max_turns or self.DEFAULT_MAX_TURNS
+        # One long-lived connection shared by all threads, serialized by the lock
+        self._lock = threading.RLock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._closed = False  # close() is final - see _conn
+        self.pragmas: Dict[str, Any] = {}
+        self.set_pragmas(pragmas)
+        # First add_turn prunes, so short sessions still cap the table; not done in
+        # _init_db because project settings may raise max_turns after construction
+        self._turns_since_prune = self.PRUNE_EVERY_TURNS - 1
+        self._has_fts = False  # file_index_fts available (SQLite built with FTS5)
         self._ensure_db_dir()
         self._init_db()
 
@@ -82,125 +174,235 @@ class MemoryStore:
         """Set maximum turns"""
         self.max_turns = max_turns
 
+    def set_pragmas(self, pragmas: Optional[Dict[str, Any]]):
+        """Project pragma overrides, applied now and to the connection once opened"""
+        # Only known pragma names with plain int/word values reach the SQL text
+        pragmas = {
+            name: value for name, value in (pragmas or {}).items()
+            if name in self.TUNABLE_PRAGMAS and
+            (isinstance(value, int) or (isinstance(value, str) and value.isalnum()))
+        }
+        with self._lock:
+            if pragmas == self.pragmas:
+                return
+            self.pragmas = pragmas
+            if self._db is not None:
+                for name, value in pragmas.items():
+                    self._db.execute(f"PRAGMA {name}={value}")
+
     def _ensure_db_dir(self):
         """Create DB directory"""
         db_dir = os.path.dirname(self.db_path)
         if db_dir:
             os.makedirs(db_dir, exist_ok=True)
 
-    def _get_conn(self) -> sqlite3.Connection:
-        """Get DB connection"""
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+    def _connect(self) -> sqlite3.Connection:
+        """Open the DB connection (autocommit; multi-statement work uses _transaction)"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None,
+                               cached_statements=self.STATEMENT_CACHE_SIZE)
         conn.row_factory = sqlite3.Row
+        # WAL: writers append to a log instead of rewriting pages, readers never
+        # block; NORMAL sync only fsyncs at checkpoints (safe in WAL mode)
+        if self.db_path != ":memory:":  # No file to keep a log next to
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{self.CACHE_SIZE_KIB}")
+        # Read pages straight from the OS page cache instead of copying them
+        # into SQLite's own buffers - warm reads after the first run are cheap
+        conn.execute(f"PRAGMA mmap_size={self.MMAP_SIZE}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        # A second window on the same project waits for the lock instead of failing
+        conn.execute(f"PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}")
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name}={value}")
         return conn
 
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        """Shared connection, opened on first use - callers hold self._lock"""
+        if self._db is None:
+            # Reopening after close() would recreate an empty DB at a path that
+            # may have been deleted (delete_project) - holders re-fetch instead
+            if self._closed:
+                raise sqlite3.ProgrammingError(
+                    f"MemoryStore is closed ({self.db_path}); use get_memory_store()"
+                )
+            self._db = self._connect()
+        return self._db
+
+    @contextmanager
+    def _transaction(self, begin: str = "BEGIN") -> Iterator[sqlite3.Connection]:
+        """Run several statements as one transaction on the shared connection"""
+        with self._lock:
+            conn = self._conn
+            if conn.in_transaction:  # Inside batch() - join the outer transaction
+                yield conn
+                return
+            conn.execute(begin)
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def batch(self):
+        """Group consecutive writes (add_turn, log_work, set_state...) into one commit
+
+        with store.batch():
+            store.add_turn("assistant", text)
+            store.log_work("CHAT", "agent", "...")
+        """
+        # IMMEDIATE takes the write lock up front, so the batch never fails midway on it
+        return self._transaction("BEGIN IMMEDIATE")
+
+    def close(self):
+        """Close the connection; the store cannot be used afterwards"""
+        with self._lock:
+            self._closed = True
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
     def _init_db(self):
         """Initialize tables"""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-
-        # Work logs table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS work_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                action TEXT NOT NULL,
-                target TEXT,
-                description TEXT,
-                result TEXT,
-                details TEXT
-            )
-        """)
-
-        # Issues table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS issues (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                created_at TEXT NOT NULL,
-                status TEXT DEFAULT 'OPEN',
-                severity TEXT DEFAULT 'MEDIUM',
-                title TEXT NOT NULL,
-                description TEXT,
-                resolved_at TEXT,
-                resolution TEXT
-            )
-        """)
-
-        # File index table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS file_index (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                path TEXT UNIQUE NOT NULL,
-                last_modified TEXT,
-                size INTEGER,
-                content_hash TEXT,
-                symbols TEXT
-            )
-        """)
-
-        # Conversation turns table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS conversation_turns (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                role TEXT NOT NULL,
-                content TEXT NOT NULL,
-                context_used TEXT
-            )
-        """)
-
-        # Key-value state table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS state (
-                key TEXT PRIMARY KEY,
-                value TEXT,
-                updated_at TEXT
-            )
-        """)
-
-        conn.commit()
-        conn.close()
+        with self._transaction() as conn:
+            # Work logs table
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS work_logs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    action TEXT NOT NULL,
+                    target TEXT,
+                    description TEXT,
+                    result TEXT,
+                    details TEXT
+                )
+            """)
+
+            # Issues table
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS issues (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created_at TEXT NOT NULL,
+                    status TEXT DEFAULT 'OPEN',
+                    severity TEXT DEFAULT 'MEDIUM',
+                    title TEXT NOT NULL,
+                    description TEXT,
+                    resolved_at TEXT,
+                    resolution TEXT
+                )
+            """)
+
+            # File index table
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS file_index (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    path TEXT UNIQUE NOT NULL,
+                    last_modified TEXT,
+                    size INTEGER,
+                    content_hash TEXT,
+                    symbols TEXT
+                )
+            """)
+
+            # Conversation turns table
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS conversation_turns (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    context_used TEXT
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_turns_ts ON conversation_turns(timestamp DESC)
+            """)
+
+            # Key-value state table
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS state (
+                    key TEXT PRIMARY KEY,
+                    value BLOB,  -- UTF-8 JSON bytes (older databases hold TEXT)
+                    updated_at TEXT
+                )
+            """)
+
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_issues_status_sev
+                ON issues(status, severity DESC, created_at DESC)
+            """)
+
+        self._init_fts()
+
+    def _init_fts(self):
+        """Full-text index over file_index.symbols (skipped if FTS5 is missing)"""
+        with self._transaction() as conn:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name='file_index_fts'"
+            ).fetchone() is not None
+            try:
+                conn.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS file_index_fts USING fts5(
+                        path UNINDEXED, symbols, content='file_index', content_rowid='id'
+                    )
+                """)
+            except sqlite3.OperationalError:
+                return  # No FTS5 in this SQLite build - LIKE search is used
+
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS file_index_ai AFTER INSERT ON file_index BEGIN
+                    INSERT INTO file_index_fts(rowid, path, symbols)
+                    VALUES (new.id, new.path, new.symbols);
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS file_index_ad AFTER DELETE ON file_index BEGIN
+                    INSERT INTO file_index_fts(file_index_fts, rowid, path, symbols)
+                    VALUES ('delete', old.id, old.path, old.symbols);
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS file_index_au AFTER UPDATE ON file_index BEGIN
+                    INSERT INTO file_index_fts(file_index_fts, rowid, path, symbols)
+                    VALUES ('delete', old.id, old.path, old.symbols);
+                    INSERT INTO file_index_fts(rowid, path, symbols)
+                    VALUES (new.id, new.path, new.symbols);
+                END
+            """)
+            if not exists:
+                # Index rows written before the FTS table existed
+                conn.execute("INSERT INTO file_index_fts(file_index_fts) VALUES ('rebuild')")
+        self._has_fts = True
 
     # ============================================
     # Work Logs
     # ============================================
 
     def log_work(self, action: str, target: str, description: str,
-                 result: str = "SUCCESS", details: Dict = None) -> int:
-        """Log work"""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO work_logs (timestamp, action, target, description, result, details)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            datetime.now().isoformat(),
-            action,
-            target,
-            description,
-            result,
-            json.dumps(details or {}, ensure_ascii=False)
-        ))
-
-        log_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        return log_id
+                 result: str = "SUCCESS", details: Dict = None,
+                 max_chars: int = None) -> int:
+        """Log work (description truncated to max_chars if given)"""
+        if max_chars is not None and len(description) > max_chars:
+            description = description[:max_chars]
+        with self._lock:
+            cursor = self._conn.execute(self._SQL_INSERT_LOG, (
+                _now_iso(),
+                action,
+                target,
+                description,
+                result,
+                jsonutil.dumps(details or {})
+            ))
+            return cursor.lastrowid
 
     def get_recent_logs(self, limit: int = 20) -> List[WorkLog]:
         """Get recent work logs"""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT * FROM work_logs ORDER BY timestamp DESC LIMIT ?
-        """, (limit,))
+        with self._lock:
+            rows = self._conn.execute(self._SQL_RECENT_LOGS, (limit,)).fetchall()
 
-        rows = cursor.fetchall()
-        conn.close()
-
-        return [WorkLog(**dict(row)) for row in rows]
+        return [WorkLog(*row) for row in rows]
 
     # ============================================
     # Issues
@@ -209,98 +411,79 @@ class MemoryStore:
     def create_issue(self, title: str, description: str,
                      severity: str = "MEDIUM") -> int:
         """Create issue"""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO issues (created_at, status, severity, title, description)
-            VALUES (?, 'OPEN', ?, ?, ?)
-        """, (datetime.now().isoformat(), severity, title, description))
-
-        issue_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self._lock:
+            cursor = self._conn.execute(
+                self._SQL_INSERT_ISSUE, (_now_iso(), severity, title, description)
+            )
+            issue_id = cursor.lastrowid
 
         self.log_work("CREATE", f"issue:{issue_id}", f"Issue created: {title}")
         return issue_id
 
     def resolve_issue(self, issue_id: int, resolution: str):
         """Resolve issue"""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            UPDATE issues SET status='RESOLVED', resolved_at=?, resolution=?
-            WHERE id=?
-        """, (datetime.now().isoformat(), resolution, issue_id))
-
-        conn.commit()
-        conn.close()
+        with self._lock:
+            self._conn.execute(
+                self._SQL_RESOLVE_ISSUE, (_now_iso(), resolution, issue_id)
+            )
 
         self.log_work("UPDATE", f"issue:{issue_id}", f"Issue resolved: {resolution}")
 
     def get_open_issues(self) -> List[Issue]:
         """Get open issues"""
-        conn = self._get_conn()
-        cursor = conn.cursor()
+        with self._lock:
+            rows = self._conn.execute(self._SQL_OPEN_ISSUES).fetchall()
 
-        cursor.execute("""
-            SELECT * FROM issues WHERE status='OPEN' ORDER BY severity DESC, created_at DESC
-        """)
+        return [Issue(*row) for row in rows]
 
-        rows = cursor.fetchall()
-        conn.close()
+    def get_context_bundle(self, limit_turns: int = 5) -> Tuple[List[str], List[str], List[Issue]]:
+        """Get recent turn columns and open issues in one read transaction
 
-        return [Issue(**dict(row)) for row in rows]
+        Returns (roles, contents, issues) - the last limit_turns turns as
+        parallel columns, oldest first; issues as in get_open_issues().
+        """
+        with self._transaction() as conn:
+            turn_rows = conn.execute(self._SQL_RECENT_TURN_COLUMNS, (limit_turns,)).fetchall()
+            issue_rows = conn.execute(self._SQL_OPEN_ISSUES).fetchall()
+
+        roles = [row[0] for row in reversed(turn_rows)]
+        contents = [row[1] for row in reversed(turn_rows)]
+        return roles, contents, [Issue(*row) for row in issue_rows]
 
     # ============================================
     # Conversation Turns
     # ============================================
 
-    def add_turn(self, role: str, content: str, context_used: str = ""):
-        """Add conversation turn (keep only recent N)"""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-
-        # Add new turn
-        cursor.execute("""
-            INSERT INTO conversation_turns (timestamp, role, content, context_used)
-            VALUES (?, ?, ?, ?)
-        """, (datetime.now().isoformat(), role, content, context_used))
-
-        # Delete old turns (keep only recent N)
-        cursor.execute("""
-            DELETE FROM conversation_turns WHERE id NOT IN (
-                SELECT id FROM conversation_turns ORDER BY timestamp DESC LIMIT ?
+    def add_turn(self, role: str, content: str, context_used: str = "",
+                 max_chars: int = None):
+        """Add conversation turn (keep only recent N, content truncated to max_chars if given)"""
+        if max_chars is not None and len(content) > max_chars:
+            content = content[:max_chars]
+        with self._lock:
+            # Add new turn
+            self._conn.execute(
+                self._SQL_INSERT_TURN, (_now_iso(), role, content, context_used)
             )
-        """, (self.max_turns,))
 
-        conn.commit()
-        conn.close()
+            # Delete old turns (keep only recent N) - batched, readers use LIMIT anyway
+            self._turns_since_prune += 1
+            if self._turns_since_prune >= self.PRUNE_EVERY_TURNS:
+                self._turns_since_prune = 0
+                self._conn.execute(self._SQL_PRUNE_TURNS, (self.max_turns,))
 
     def get_recent_turns(self, limit: int = 5) -> List[ConversationTurn]:
         """Get recent conversation turns"""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT * FROM conversation_turns ORDER BY timestamp DESC LIMIT ?
-        """, (limit,))
-
-        rows = cursor.fetchall()
-        conn.close()
+        with self._lock:
+            rows = self._conn.execute(self._SQL_RECENT_TURNS, (limit,)).fetchall()
 
         # Sort by time (oldest first)
-        turns = [ConversationTurn(**dict(row)) for row in rows]
+        turns = [ConversationTurn(*row) for row in rows]
         return list(reversed(turns))
 
     def clear_conversation(self):
         """Clear conversation"""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM conversation_turns")
-        conn.commit()
-        conn.close()
+        with self._lock:
+            self._conn.execute(self._SQL_CLEAR_TURNS)
 
     # ============================================
     # State Storage
@@ -308,28 +491,19 @@ class MemoryStore:
 
     def set_state(self, key: str, value: Any):
         """Save state"""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT OR REPLACE INTO state (key, value, updated_at)
-            VALUES (?, ?, ?)
-        """, (key, json.dumps(value, ensure_ascii=False), datetime.now().isoformat()))
-
-        conn.commit()
-        conn.close()
+        with self._lock:
+            self._conn.execute(
+                self._SQL_SET_STATE, (key, jsonutil.dumps_bytes(value), _now_iso())
+            )
 
     def get_state(self, key: str, default: Any = None) -> Any:
         """Get state"""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT value FROM state WHERE key=?", (key,))
-        row = cursor.fetchone()
-        conn.close()
+        with self._lock:
+            row = self._conn.execute(self._SQL_GET_STATE, (key,)).fetchone()
 
         if row:
-            return json.loads(row["value"])
+            # bytes for rows written as BLOB, str for legacy TEXT rows - loads takes both
+            return jsonutil.loads(row["value"])
         return default
 
     # ============================================
@@ -339,49 +513,39 @@ class MemoryStore:
     def update_file_index(self, path: str, size: int, content_hash: str,
                           symbols: List[str] = None):
         """Update file index"""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT OR REPLACE INTO file_index (path, last_modified, size, content_hash, symbols)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            path,
-            datetime.now().isoformat(),
-            size,
-            content_hash,
-            json.dumps(symbols or [], ensure_ascii=False)
-        ))
-
-        conn.commit()
-        conn.close()
+        with self._lock:
+            self._conn.execute(self._SQL_UPSERT_FILE_INDEX, (
+                path,
+                _now_iso(),
+                size,
+                content_hash,
+                jsonutil.dumps(symbols or [])
+            ))
 
     def get_file_index(self, path: str) -> Optional[FileIndex]:
         """Get file index"""
-        conn = self._get_conn()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT * FROM file_index WHERE path=?", (path,))
-        row = cursor.fetchone()
-        conn.close()
+        with self._lock:
+            row = self._conn.execute(self._SQL_GET_FILE_INDEX, (path,)).fetchone()
 
         if row:
-            return FileIndex(**dict(row))
+            return FileIndex(*row)
         return None
 
     def search_files_by_symbol(self, symbol: str) -> List[FileIndex]:
-        """Search files by symbol"""
-        conn = self._get_conn()
-        cursor = conn.cursor()
+        """Search files by symbol
 
-        cursor.execute("""
-            SELECT * FROM file_index WHERE symbols LIKE ?
-        """, (f"%{symbol}%",))
+        With FTS5 this is a token-prefix match ("get_mem" finds get_memory_store);
+        without it, a substring scan of the symbols column.
+        """
+        with self._lock:
+            if self._has_fts and symbol.strip():
+                # Quoted phrase + prefix: punctuation in the symbol can't break the query
+                query = '"' + symbol.replace('"', '""') + '"*'
+                rows = self._conn.execute(self._SQL_SEARCH_SYMBOL_FTS, (query,)).fetchall()
+            else:
+                rows = self._conn.execute(self._SQL_SEARCH_SYMBOL, (f"%{symbol}%",)).fetchall()
 
-        rows = cursor.fetchall()
-        conn.close()
-
-        return [FileIndex(**dict(row)) for row in rows]
+        return [FileIndex(*row) for row in rows]
 
 
 # ============================================
@@ -390,42 +554,73 @@ class MemoryStore:
 
 _memory_store: Optional[MemoryStore] = None
 _current_db_path: Optional[str] = None
+_project_db_path: Optional[Tuple[str, str]] = None  # (active project id, its DB path)
+
+
+def _default_db_path() -> str:
+    """DB used when no project is active - under the user data root, not the cwd"""
+    from paths import get_exe_path
+    base = os.environ.get("MADORO_CODE_BASE") or get_exe_path()
+    return os.path.join(os.path.abspath(base), "db", "memory.db")
 
 
 def get_memory_store(db_path: str = None) -> MemoryStore:
     """Memory store singleton (supports per-project DB)"""
-    global _memory_store, _current_db_path
+    global _memory_store, _current_db_path, _project_db_path
 
-    max_turns = 50  # Default
+    pm = None
+    active = None
 
-    # Get DB path and settings from project manager
+    # Get DB path from project manager
     if db_path is None:
         try:
             from project_manager import get_project_manager
             pm = get_project_manager()
-            db_path = pm.get_project_db_path()
-            settings = pm.get_project_settings()
-            max_turns = settings.get("max_turns", 50)
-        except:
-            db_path = "db/memory.db"
+            active = pm.config.get("active_project")
+        except (ImportError, OSError) as e:
+            print(f"[Memory] Project manager unavailable, using the default DB: {e}")
+            active = None
+
+        if active is None:
+            db_path = _default_db_path()
+        else:
+            # Same project as last call -> same path, no directory check
+            if _project_db_path is None or _project_db_path[0] != active:
+                _project_db_path = (active, pm.get_project_db_path(active))
+            db_path = _project_db_path[1]
 
     # Create new instance if DB path changed
     if _memory_store is None or _current_db_path != db_path:
-        _memory_store = MemoryStore(db_path, max_turns=max_turns)
+        if _memory_store is not None:
+            _memory_store.close()
+        _memory_store = MemoryStore(db_path)
         _current_db_path = db_path
-        print(f"[Memory] DB loaded: {db_path} (max_turns: {max_turns})")
-    else:
-        # Update max_turns on existing instance
-        _memory_store.set_max_turns(max_turns)
+        print(f"[Memory] DB loaded: {db_path}")
+
+    # Project settings live in the project's own DB (read through the store just opened)
+    if active is not None:
+        settings = pm.get_project_settings(active)
+        _memory_store.set_max_turns(settings.get("max_turns", 50))
+        _memory_store.set_pragmas(settings.get("sqlite_pragmas"))
 
     return _memory_store
 
 
+def peek_memory_store(db_path: str) -> Optional[MemoryStore]:
+    """The shared store if it is open on db_path (no project lookup, no opening)"""
+    if _memory_store is not None and _current_db_path == db_path:
+        return _memory_store
+    return None
+
+
 def reset_memory_store():
     """Reset for testing"""
-    global _memory_store, _current_db_path
+    global _memory_store, _current_db_path, _project_db_path
+    if _memory_store is not None:
+        _memory_store.close()  # Holders of the old store must call get_memory_store() again
     _memory_store = None
     _current_db_path = None
+    _project_db_path = None
 
 
 # ============================================
@@ -479,6 +674,7 @@ if __name__ == "__main__":
         store.set_state("current_model", "qwen-coder")
         model = store.get_state("current_model")
         print(f"  Current model: {model}")
+        store.close()  # Release the DB file before the temp dir is removed
 
         print("\n" + "=" * 60)
         print("  All tests passed!")
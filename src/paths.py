@@ -0,0 +1,35 @@
+"""
+MADORO CODE - Path Resolution
+
+- Bundle path: read-only resources (config, assets) - _MEIPASS in EXE
+- EXE path: user data (projects, db) - directory of the executable
+
+Both are pure functions of process state, so they are memoized.
+"""
+
+import os
+import sys
+from functools import lru_cache
+
+# Repository root when running from source (src/..)
+_SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@lru_cache(maxsize=None)
+def get_base_path() -> str:
+    """Base path for bundled files (PyInstaller EXE or script)"""
+    if getattr(sys, 'frozen', False):
+        # PyInstaller EXE - bundled files live in _MEIPASS
+        return sys._MEIPASS
+    return _SOURCE_ROOT
+
+
+@lru_cache(maxsize=None)
+def get_exe_path() -> str:
+    """Actual directory of the EXE file (for user data)"""
+    if getattr(sys, 'frozen', False):
+        # sys.executable gives the actual EXE path, not the shortcut location
+        exe_path = os.path.dirname(os.path.abspath(sys.executable))
+        print(f"[Main] sys.executable: {sys.executable}")
+        return exe_path
+    return _SOURCE_ROOT
@@ -4,13 +4,112 @@ Multi-project management (create, switch, delete)
 """
 
 import os
-import json
+import re
+import copy
+import atexit
 import shutil
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Any, Iterator
 from dataclasses import dataclass, asdict
 
+import jsonutil
+from memory import _now_iso  # Same local ISO timestamps as the memory DB rows
+
+
+# Parsed JSON files: path -> (st_mtime_ns, st_size, data). Entries are shared,
+# so callers copy before mutating. Writes through _store_json refresh the entry.
+_json_cache: Dict[str, tuple] = {}
+_INVALID_JSON = object()  # Cached in place of data for a file that failed to parse
+
+
+def _load_json_cached(path: Path) -> Any:
+    """Parsed JSON file, re-read only when its mtime or size changes"""
+    key = str(path)
+    st = os.stat(key)
+    cached = _json_cache.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        if cached[2] is _INVALID_JSON:
+            # Still the same broken file - fail without reading it again
+            raise ValueError(f"Invalid JSON (unchanged): {key}")
+        return cached[2]
+    with open(key, "rb") as f:
+        raw = f.read()
+    try:
+        data = jsonutil.loads(raw)
+    except ValueError as e:
+        _json_cache[key] = (st.st_mtime_ns, st.st_size, _INVALID_JSON)
+        print(f"[Project] Invalid JSON in {key}: {e}")
+        raise
+    _json_cache[key] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+
+def _write_json(path: Path, data: Any):
+    """Write data as indented JSON atomically (a crash never leaves a truncated file)"""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(jsonutil.dumps_pretty_bytes(data))
+    os.replace(tmp, path)
+
+
+def _store_json(path: Path, data: Any):
+    """Write data as JSON and cache it (data must not be mutated afterwards)"""
+    key = str(path)
+    _write_json(path, data)
+    st = os.stat(key)
+    _json_cache[key] = (st.st_mtime_ns, st.st_size, data)
+
+
+# Project id slug: anything but word characters (Unicode letters, digits, "_")
+_SLUG_RE = re.compile(r"\W+")
+
+# SSOT templates written into a new project's directory
+_HANDOVER_TEMPLATE = """# {name} - HANDOVER
+
+## Current State
+- Project initialization complete
+- Created: {today}
+
+## Completed Tasks
+- [ ] Project setup
+
+## In Progress
+- None
+
+## Next Steps
+- Design project structure
+- Implement core features
+
+## Notes
+- This file helps MADORO CODE understand project state
+- Update when tasks are completed
+"""
+
+_CONSTITUTION_TEMPLATE = """# {name} - CONSTITUTION
+
+## Project Principles
+1. Code quality first
+2. Maintain test coverage
+3. Documentation required
+
+## Tech Stack
+- (Specify technologies here)
+
+## Coding Conventions
+- (Specify coding rules here)
+
+## Prohibited
+- Hardcoded secrets
+- Deployment without tests
+
+## Reference Documents
+- README.md
+- HANDOVER.md
+"""
+
 
 @dataclass
 class Project:
@@ -33,6 +132,11 @@ class Project:
 class ProjectManager:
     """Project Manager"""
 
+    SAVE_DELAY = 0.5  # Seconds; switch/update saves within this window write once
+    # State key in each project's memory.db (projects.json stays the project index)
+    SETTINGS_KEY = "project_settings"
+    DEFAULT_SETTINGS = {"max_turns": 50, "tech_stack": ""}
+
     def __init__(self, base_path: str = None):
         if base_path is None:
             base_path = os.environ.get('MADORO_CODE_BASE', '.')
@@ -46,21 +150,55 @@ class ProjectManager:
 
         # Load config
         self.config = self._load_config()
+        # id -> entry dict in self.config["projects"] (same objects; the list keeps file order)
+        self._projects_by_id: Dict[str, Dict] = {
+            p["id"]: p for p in self.config.setdefault("projects", [])
+        }
+
+        # Deferred save: snapshot of self.config waiting for the timer (or exit)
+        self._save_lock = threading.Lock()
+        self._pending_config: Optional[Dict] = None
+        self._save_timer: Optional[threading.Timer] = None
 
     def _load_config(self) -> Dict:
         """Load project configuration"""
-        if self.config_file.exists():
-            try:
-                with open(self.config_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except:
-                pass
-        return {"projects": [], "active_project": None}
+        try:
+            return copy.deepcopy(_load_json_cached(self.config_file))
+        except (OSError, ValueError):
+            return {"projects": [], "active_project": None}
 
     def _save_config(self):
-        """Save project configuration"""
-        with open(self.config_file, "w", encoding="utf-8") as f:
-            json.dump(self.config, f, ensure_ascii=False, indent=2)
+        """Save project configuration now (supersedes a pending deferred save)"""
+        snapshot = copy.deepcopy(self.config)
+        with self._save_lock:
+            self._cancel_deferred_save()
+            _store_json(self.config_file, snapshot)
+
+    def _save_config_later(self):
+        """Save project configuration after SAVE_DELAY (for last_opened-style updates)"""
+        # Snapshot now, so the timer thread never reads self.config while it changes
+        snapshot = copy.deepcopy(self.config)
+        with self._save_lock:
+            self._pending_config = snapshot
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def _cancel_deferred_save(self):
+        """Drop the pending snapshot and its timer - caller holds _save_lock"""
+        self._pending_config = None
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+
+    def flush(self):
+        """Write a pending deferred save, if any (the singleton's also runs at exit)"""
+        with self._save_lock:
+            snapshot = self._pending_config
+            self._cancel_deferred_save()
+            if snapshot is not None:
+                _store_json(self.config_file, snapshot)
 
     def list_projects(self) -> List[Project]:
         """List projects"""
@@ -68,10 +206,8 @@ class ProjectManager:
 
     def get_project(self, project_id: str) -> Optional[Project]:
         """Get project"""
-        for p in self.config.get("projects", []):
-            if p["id"] == project_id:
-                return Project.from_dict(p)
-        return None
+        p = self._projects_by_id.get(project_id)
+        return Project.from_dict(p) if p is not None else None
 
     def get_active_project(self) -> Optional[Project]:
         """Get current active project"""
@@ -84,19 +220,17 @@ class ProjectManager:
                        tech_stack: str = "", max_turns: int = 50) -> Project:
         """Create new project"""
         # Generate ID (name-based slug)
-        project_id = name.lower().replace(" ", "_").replace("-", "_")
-        project_id = "".join(c for c in project_id if c.isalnum() or c == "_")
+        project_id = _SLUG_RE.sub("", name.lower().replace(" ", "_").replace("-", "_"))
 
         # Check duplicates
-        existing_ids = [p["id"] for p in self.config.get("projects", [])]
-        if project_id in existing_ids:
+        if project_id in self._projects_by_id:
             # Append number
             i = 2
-            while f"{project_id}_{i}" in existing_ids:
+            while f"{project_id}_{i}" in self._projects_by_id:
                 i += 1
             project_id = f"{project_id}_{i}"
 
-        now = datetime.now().isoformat()
+        now = _now_iso()
         project = Project(
             id=project_id,
             name=name,
@@ -106,31 +240,23 @@ class ProjectManager:
             description=description
         )
 
-        # Create project data directory
-        project_data_dir = self.projects_dir / project_id
-        project_data_dir.mkdir(parents=True, exist_ok=True)
-
-        # Create project meta file
-        meta_file = project_data_dir / "project.json"
-        with open(meta_file, "w", encoding="utf-8") as f:
-            json.dump(project.to_dict(), f, ensure_ascii=False, indent=2)
-
-        # Create project settings file
-        settings_file = project_data_dir / "settings.json"
+        # Settings live in the project's own memory DB
         settings = {
             "tech_stack": tech_stack,
             "max_turns": max_turns,
             "created_at": now,
             "updated_at": now
         }
-        with open(settings_file, "w", encoding="utf-8") as f:
-            json.dump(settings, f, ensure_ascii=False, indent=2)
+        with self._project_store(project_id) as store:
+            store.set_state(self.SETTINGS_KEY, settings)
 
         # Create template SSOT files (if not exist in project path)
         self._create_ssot_templates(Path(path), name)
 
         # Add to config
-        self.config.setdefault("projects", []).append(project.to_dict())
+        entry = project.to_dict()
+        self.config["projects"].append(entry)
+        self._projects_by_id[project_id] = entry
         self.config["active_project"] = project_id
         self._save_config()
 
@@ -138,71 +264,37 @@ class ProjectManager:
 
     def _create_ssot_templates(self, project_path: Path, project_name: str):
         """Create SSOT template files"""
-        project_path.mkdir(parents=True, exist_ok=True)
+        # One directory read instead of an exists() stat per template
+        try:
+            with os.scandir(project_path) as entries:
+                existing = {e.name for e in entries}
+        except FileNotFoundError:
+            project_path.mkdir(parents=True, exist_ok=True)
+            existing = set()
+        today = datetime.now().strftime("%Y-%m-%d")
 
         # HANDOVER.md
         handover_path = project_path / "HANDOVER.md"
-        if not handover_path.exists():
-            handover_content = f"""# {project_name} - HANDOVER
-
-## Current State
-- Project initialization complete
-- Created: {datetime.now().strftime("%Y-%m-%d")}
-
-## Completed Tasks
-- [ ] Project setup
-
-## In Progress
-- None
-
-## Next Steps
-- Design project structure
-- Implement core features
-
-## Notes
-- This file helps MADORO CODE understand project state
-- Update when tasks are completed
-"""
-            handover_path.write_text(handover_content, encoding="utf-8")
+        if "HANDOVER.md" not in existing:
+            handover_path.write_text(
+                _HANDOVER_TEMPLATE.format(name=project_name, today=today), encoding="utf-8")
 
         # CONSTITUTION.md
         constitution_path = project_path / "CONSTITUTION.md"
-        if not constitution_path.exists():
-            constitution_content = f"""# {project_name} - CONSTITUTION
-
-## Project Principles
-1. Code quality first
-2. Maintain test coverage
-3. Documentation required
-
-## Tech Stack
-- (Specify technologies here)
-
-## Coding Conventions
-- (Specify coding rules here)
-
-## Prohibited
-- Hardcoded secrets
-- Deployment without tests
-
-## Reference Documents
-- README.md
-- HANDOVER.md
-"""
-            constitution_path.write_text(constitution_content, encoding="utf-8")
+        if "CONSTITUTION.md" not in existing:
+            constitution_path.write_text(
+                _CONSTITUTION_TEMPLATE.format(name=project_name), encoding="utf-8")
 
     def switch_project(self, project_id: str) -> Optional[Project]:
         """Switch project"""
-        project = self.get_project(project_id)
-        if project:
+        p = self._projects_by_id.get(project_id)
+        if p is not None:
+            project = Project.from_dict(p)
             # Update last_opened
-            for p in self.config.get("projects", []):
-                if p["id"] == project_id:
-                    p["last_opened"] = datetime.now().isoformat()
-                    break
+            p["last_opened"] = _now_iso()
 
             self.config["active_project"] = project_id
-            self._save_config()
+            self._save_config_later()
             return project
         return None
 
@@ -212,32 +304,34 @@ class ProjectManager:
 
     def update_project(self, project_id: str, name: str = None, description: str = None) -> Optional[Project]:
         """Update project basic info"""
-        for p in self.config.get("projects", []):
-            if p["id"] == project_id:
-                if name is not None:
-                    p["name"] = name
-                if description is not None:
-                    p["description"] = description
-                p["last_opened"] = datetime.now().isoformat()
-                self._save_config()
-                return Project.from_dict(p)
-        return None
+        p = self._projects_by_id.get(project_id)
+        if p is None:
+            return None
+        if name is not None:
+            p["name"] = name
+        if description is not None:
+            p["description"] = description
+        p["last_opened"] = _now_iso()
+        self._save_config_later()
+        return Project.from_dict(p)
 
     def delete_project(self, project_id: str, delete_data: bool = False) -> bool:
         """Delete project"""
-        projects = self.config.get("projects", [])
-        new_projects = [p for p in projects if p["id"] != project_id]
-
-        if len(new_projects) == len(projects):
+        if project_id not in self._projects_by_id:
             return False  # No project to delete
 
         # Delete data (optional)
         if delete_data:
             project_data_dir = self.projects_dir / project_id
             if project_data_dir.exists():
+                # Close the open memory DB first (Windows cannot delete open files)
+                from memory import reset_memory_store
+                reset_memory_store()
                 shutil.rmtree(project_data_dir)
 
         # Update config
+        del self._projects_by_id[project_id]
+        new_projects = [p for p in self.config["projects"] if p["id"] != project_id]
         self.config["projects"] = new_projects
         if self.config.get("active_project") == project_id:
             self.config["active_project"] = new_projects[0]["id"] if new_projects else None
@@ -255,33 +349,53 @@ class ProjectManager:
 
         return str(project_data_dir / "memory.db")
 
+    @contextmanager
+    def _project_store(self, project_id: str) -> Iterator[Any]:
+        """MemoryStore on a project's memory.db - the shared one when it is already open"""
+        from memory import MemoryStore, peek_memory_store
+        db_path = self.get_project_db_path(project_id)
+        store = peek_memory_store(db_path)
+        if store is not None:
+            yield store
+            return
+        store = MemoryStore(db_path)
+        try:
+            yield store
+        finally:
+            store.close()
+
     def get_project_settings(self, project_id: str = None) -> Dict:
         """Get project settings"""
         if project_id is None:
             project_id = self.config.get("active_project")
 
-        if not project_id:
-            return {"max_turns": 50, "tech_stack": ""}
+        if not project_id or not (self.projects_dir / project_id).is_dir():
+            return dict(self.DEFAULT_SETTINGS)  # Nothing to read - do not create a DB
 
-        settings_file = self.projects_dir / project_id / "settings.json"
-        if settings_file.exists():
-            try:
-                with open(settings_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except:
-                pass
+        # A fresh dict per call - callers update it and pass it to save_project_settings
+        with self._project_store(project_id) as store:
+            settings = store.get_state(self.SETTINGS_KEY)
+            if settings is None:
+                settings = self._import_settings_file(project_id, store)
 
-        return {"max_turns": 50, "tech_stack": ""}
+        return settings if isinstance(settings, dict) else dict(self.DEFAULT_SETTINGS)
+
+    def _import_settings_file(self, project_id: str, store) -> Optional[Dict]:
+        """Move a settings.json from before the DB-backed settings into the DB (once)"""
+        try:
+            settings = _load_json_cached(self.projects_dir / project_id / "settings.json")
+        except (OSError, ValueError):
+            return None
+        if not isinstance(settings, dict):
+            return None
+        store.set_state(self.SETTINGS_KEY, settings)
+        return dict(settings)
 
     def save_project_settings(self, project_id: str, settings: Dict):
         """Save project settings"""
-        project_data_dir = self.projects_dir / project_id
-        project_data_dir.mkdir(parents=True, exist_ok=True)
-
-        settings["updated_at"] = datetime.now().isoformat()
-        settings_file = project_data_dir / "settings.json"
-        with open(settings_file, "w", encoding="utf-8") as f:
-            json.dump(settings, f, ensure_ascii=False, indent=2)
+        settings["updated_at"] = _now_iso()
+        with self._project_store(project_id) as store:
+            store.set_state(self.SETTINGS_KEY, settings)
 
     def import_existing_project(self, name: str, path: str, description: str = "") -> Project:
         """Import existing project (when HANDOVER.md etc. already exist)"""
@@ -303,4 +417,13 @@ def get_project_manager(base_path: str = None) -> ProjectManager:
 def reset_project_manager():
     """Reset for testing"""
     global _project_manager
+    if _project_manager is not None:
+        _project_manager.flush()  # Land its pending save before a new manager reads the file
     _project_manager = None
+
+
+@atexit.register
+def _flush_project_manager():
+    """Write the current manager's deferred save at exit (discarded ones were flushed on reset)"""
+    if _project_manager is not None:
+        _project_manager.flush()
@@ -22,6 +22,8 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QSettings, QMimeData, QUrl
 from PyQt6.QtGui import QFont, QColor, QPalette, QIcon, QImage, QCloseEvent
 
+from paths import get_base_path
+
 
 # ============================================
 # 🎨 Nordic Olive Retro Theme Colors
@@ -500,7 +502,7 @@ class ChatWindow(QMainWindow):
 
             agent_module._agent = None
             llm_module._llm_client = None
-            memory_module._memory_store = None
+            memory_module.reset_memory_store()  # Closes the old DB connection
             context_module._context_builder = None
 
             from agent import Agent
@@ -551,7 +553,7 @@ class ChatWindow(QMainWindow):
 
         # Set window icon (use bundle path for EXE)
         import os
-        bundle_path = os.environ.get('MADORO_CODE_BUNDLE', str(Path(__file__).parent.parent.parent))
+        bundle_path = os.environ.get('MADORO_CODE_BUNDLE') or get_base_path()
         icon_path = Path(bundle_path) / "assets" / "icon.ico"
         if icon_path.exists():
             self.setWindowIcon(QIcon(str(icon_path)))
@@ -12,6 +12,8 @@ from PyQt6.QtGui import QIcon, QFont
 from pathlib import Path
 import difflib
 
+from paths import get_base_path
+
 
 class HandoverApprovalDialog(QDialog):
     """Dialog for approving HANDOVER.md changes"""
@@ -28,7 +30,7 @@ class HandoverApprovalDialog(QDialog):
 
         # Set window icon
         import os
-        bundle_path = os.environ.get('MADORO_CODE_BUNDLE', str(Path(__file__).parent.parent.parent))
+        bundle_path = os.environ.get('MADORO_CODE_BUNDLE') or get_base_path()
         icon_path = Path(bundle_path) / "assets" / "icon.ico"
         if icon_path.exists():
             self.setWindowIcon(QIcon(str(icon_path)))
@@ -230,7 +232,7 @@ class SSOTFileChangeDialog(QDialog):
 
         # Set window icon
         import os
-        bundle_path = os.environ.get('MADORO_CODE_BUNDLE', str(Path(__file__).parent.parent.parent))
+        bundle_path = os.environ.get('MADORO_CODE_BUNDLE') or get_base_path()
         icon_path = Path(bundle_path) / "assets" / "icon.ico"
         if icon_path.exists():
             self.setWindowIcon(QIcon(str(icon_path)))
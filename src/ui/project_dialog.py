@@ -11,6 +11,8 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QIcon
 from pathlib import Path
 
+from paths import get_base_path
+
 
 class ProjectDialog(QDialog):
     """Project creation/edit dialog"""
@@ -25,7 +27,7 @@ class ProjectDialog(QDialog):
 
         # Set window icon (use bundle path for EXE)
         import os
-        bundle_path = os.environ.get('MADORO_CODE_BUNDLE', str(Path(__file__).parent.parent.parent))
+        bundle_path = os.environ.get('MADORO_CODE_BUNDLE') or get_base_path()
         icon_path = Path(bundle_path) / "assets" / "icon.ico"
         if icon_path.exists():
             self.setWindowIcon(QIcon(str(icon_path)))
@@ -289,14 +291,9 @@ Format: Date, Decision, Rationale, Alternatives, Impact""")
         try:
             from project_manager import get_project_manager
             pm = get_project_manager()
-            project_data_dir = pm.projects_dir / project.id
-            settings_path = project_data_dir / "settings.json"
-            if settings_path.exists():
-                import json
-                with open(settings_path, "r", encoding="utf-8") as f:
-                    settings = json.load(f)
-                    self.turn_spin.setValue(settings.get("max_turns", 50))
-                    self.stack_edit.setText(settings.get("tech_stack", ""))
+            settings = pm.get_project_settings(project.id)
+            self.turn_spin.setValue(settings.get("max_turns", 50))
+            self.stack_edit.setText(settings.get("tech_stack", ""))
         except:
             pass
 
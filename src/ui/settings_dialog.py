@@ -14,6 +14,14 @@ from pathlib import Path
 import yaml
 import os
 
+from paths import get_base_path
+
+# libyaml C loader when available
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 class SettingsDialog(QDialog):
     """Settings dialog for API keys and configuration"""
@@ -27,7 +35,7 @@ class SettingsDialog(QDialog):
         self.setMinimumSize(500, 400)
 
         # Set window icon
-        bundle_path = os.environ.get('MADORO_CODE_BUNDLE', str(Path(__file__).parent.parent.parent))
+        bundle_path = os.environ.get('MADORO_CODE_BUNDLE') or get_base_path()
         icon_path = Path(bundle_path) / "assets" / "icon.ico"
         if icon_path.exists():
             self.setWindowIcon(QIcon(str(icon_path)))
@@ -45,7 +53,7 @@ class SettingsDialog(QDialog):
                 return config_path
 
         # Fallback to bundle path
-        bundle_path = os.environ.get('MADORO_CODE_BUNDLE', str(Path(__file__).parent.parent.parent))
+        bundle_path = os.environ.get('MADORO_CODE_BUNDLE') or get_base_path()
         return Path(bundle_path) / "config" / "models.yaml"
 
     def _load_config(self) -> dict:
@@ -53,7 +61,7 @@ class SettingsDialog(QDialog):
         try:
             if self.config_path.exists():
                 with open(self.config_path, 'r', encoding='utf-8') as f:
-                    return yaml.safe_load(f) or {}
+                    return yaml.load(f, Loader=_YamlLoader) or {}
         except Exception as e:
             print(f"Failed to load config: {e}")
         return {}